@@ -3,9 +3,21 @@
 # (c) Dr. Yves J. Hilpisch
 # AI-Powered by GPT-5
 
-"""Chapter 4 — Control flow: decisions, loops, and exceptions."""
+"""Chapter 4 — Control flow: decisions, loops, and exceptions.
+
+Run with ``--bench`` to try the array versions of ``bucket`` and
+``safe_div`` and compare them with list comprehensions (10^6 to 10^8
+elements). NumPy is only imported by the array versions, so the plain
+chapter starts without it.
+"""
 
 from __future__ import annotations
+import sys
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def bucket(x: int) -> str:
@@ -24,12 +36,102 @@ def safe_div(a: float, b: float) -> float | None:
         return None
 
 
+BUCKETS = ("negative", "zero", "positive")
+
+
+def bucket_codes(x) -> np.ndarray:
+    """Index into ``BUCKETS`` per element, same branches as ``bucket``
+    (so NaN, like in the scalar version, counts as positive)."""
+    import numpy as np
+
+    x = np.asarray(x)
+    # 2 - [x < 0] - [x <= 0]: negative 0, zero 1, positive (and NaN) 2
+    return 2 - (x < 0).view(np.int8) - (x <= 0).view(np.int8)
+
+
+def bucket_array(x):
+    """``bucket`` for a NumPy array or pandas Series, without a Python loop.
+
+    An array gives an object array of the three shared label strings; a
+    Series gives a categorical Series with the same index.
+    """
+    import numpy as np
+
+    codes = bucket_codes(x)
+    if type(x).__module__.startswith("pandas"):
+        import pandas as pd
+
+        return pd.Series(pd.Categorical.from_codes(codes, BUCKETS),
+                         index=x.index, name=x.name)
+    return np.array(BUCKETS, dtype=object)[codes]
+
+
+def safe_div_array(a, b, masked: bool = False):
+    """``a / b`` elementwise; NaN (or masked) where ``safe_div`` gives None.
+
+    Only zero divisors are special: other IEEE results (inf, NaN from NaN
+    inputs) pass through as in scalar float division. A Series ``a`` gives
+    a Series with its index (unless ``masked``).
+    """
+    import numpy as np
+
+    series = a if type(a).__module__.startswith("pandas") else None
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    zero = b == 0
+    out = np.divide(a, b, out=np.full(np.broadcast(a, b).shape, np.nan),
+                    where=~zero)
+    if masked:
+        return np.ma.masked_array(out, mask=np.broadcast_to(zero, out.shape))
+    if series is not None:
+        import pandas as pd
+
+        return pd.Series(out, index=series.index, name=series.name)
+    return out
+
+
+def benchmark(sizes=(10**6, 10**7, 10**8), list_max: int = 10**7) -> None:
+    """Array versions vs list comprehensions; lists stop at ``list_max``."""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>11} {'bucket: list':>13} {'labels':>9} {'codes':>9} "
+          f"{'safe_div: list':>15} {'array':>9}")
+    for n in sizes:
+        x = rng.integers(-5, 6, n).astype(np.float64)  # about 9% zeros
+        t0 = time.perf_counter()
+        bucket_array(x)
+        t_arr = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        bucket_codes(x)
+        t_codes = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        safe_div_array(x, x[::-1])
+        t_div = time.perf_counter() - t0
+        if n <= list_max:
+            xs, ys = x.tolist(), x[::-1].tolist()
+            t0 = time.perf_counter()
+            [bucket(v) for v in xs]
+            t_list = f"{time.perf_counter() - t0:12.3f}s"
+            t0 = time.perf_counter()
+            [safe_div(p, q) for p, q in zip(xs, ys)]
+            t_dlist = f"{time.perf_counter() - t0:14.3f}s"
+            del xs, ys
+        else:
+            t_list, t_dlist = f"{'-':>13}", f"{'-':>15}"
+        print(f"{n:>11,} {t_list} {t_arr:8.3f}s {t_codes:8.3f}s {t_dlist} {t_div:8.3f}s")
+        del x
+
+
 def main() -> None:
     print([bucket(i) for i in (-1, 0, 1)])
     print("safe_div(4, 2)=", safe_div(4, 2))
     print("safe_div(1, 0)=", safe_div(1, 0))
+    if "--bench" in sys.argv[1:]:
+        print("bucket_array:", bucket_array([-1.5, 0.0, 2.0]))
+        print("safe_div_array:", safe_div_array([4, 1, 0], [2, 0, 5]))
+        benchmark()
 
 
 if __name__ == "__main__":
     main()
-
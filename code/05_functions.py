@@ -3,11 +3,25 @@
 # (c) Dr. Yves J. Hilpisch
 # AI-Powered by GPT-5
 
-"""Chapter 5 — Functions: signatures, defaults, closures."""
+"""Chapter 5 — Functions: signatures, defaults, closures.
+
+Run with ``--bench`` to compare ``memoize`` with ``functools.lru_cache``
+and the Fibonacci variants with each other. NumPy is only imported by
+``fib_many``, so the plain chapter starts without it.
+"""
 
 from __future__ import annotations
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, namedtuple
 from math import pi
-from functools import wraps
+from functools import lru_cache, wraps
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def vol_sphere(r: float) -> float:
@@ -15,15 +29,70 @@ def vol_sphere(r: float) -> float:
     return 4.0 / 3.0 * pi * r ** 3
 
 
-def memoize(fn):
-    cache: dict[tuple, object] = {}
+CacheInfo = namedtuple("CacheInfo", "hits misses maxsize currsize")
+_KWARGS = object()  # separates positional from keyword arguments in keys
+
+
+def _make_key(args: tuple, kwargs: dict) -> tuple:
+    """Hashable key; keyword order does not matter (f(a=1, b=2) == f(b=2, a=1))."""
+    return args + (_KWARGS,) + tuple(sorted(kwargs.items()))
+
+
+def memoize(fn=None, *, maxsize: int | None = 128, ttl: float | None = None):
+    """Cache results of a pure function, like ``functools.lru_cache``.
+
+    - at most ``maxsize`` entries, least recently used evicted first
+      (``None``: unbounded)
+    - entries older than ``ttl`` seconds are recomputed (``None``: never)
+    - keyword arguments are part of the key
+    - safe to call from several threads: one lock guards the store, but it
+      is released while ``fn`` runs (so recursive functions work and slow
+      calls do not block hits)
+    - ``wrapper.cache_info()`` and ``wrapper.cache_clear()`` as in functools
+
+    Use as ``@memoize`` or ``@memoize(maxsize=1024, ttl=60)``.
+    """
+    if fn is None:
+        return lambda f: memoize(f, maxsize=maxsize, ttl=ttl)
+
+    cache: OrderedDict[tuple, tuple[object, float]] = OrderedDict()
+    get, touch = cache.get, cache.move_to_end  # bound once: hits are hot
+    lock = threading.Lock()
+    clock = time.monotonic
+    hits = misses = 0
 
     @wraps(fn)
-    def wrapper(*args):
-        if args not in cache:
-            cache[args] = fn(*args)
-        return cache[args]
+    def wrapper(*args, **kwargs):
+        nonlocal hits, misses
+        key = _make_key(args, kwargs) if kwargs else args
+        now = clock() if ttl is not None else 0.0
+        with lock:
+            entry = get(key)
+            if entry is not None and (ttl is None or now - entry[1] < ttl):
+                touch(key)
+                hits += 1
+                return entry[0]
+            misses += 1
+        value = fn(*args, **kwargs)  # outside the lock
+        with lock:
+            cache[key] = (value, now)
+            touch(key)
+            if maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)
+        return value
+
+    def cache_info() -> CacheInfo:
+        with lock:
+            return CacheInfo(hits, misses, maxsize, len(cache))
 
+    def cache_clear() -> None:
+        nonlocal hits, misses
+        with lock:
+            cache.clear()
+            hits = misses = 0
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
     return wrapper
 
 
@@ -32,11 +101,139 @@ def fib(n: int) -> int:
     return n if n < 2 else fib(n - 1) + fib(n - 2)
 
 
+INT64_MAX_FIB = 92  # F(92) is the largest Fibonacci number below 2**63
+
+
+def _fib_pair(n: int) -> tuple[int, int]:
+    """``(F(n), F(n + 1))`` by fast doubling, one step per bit of ``n``.
+
+    F(2k) = F(k) * (2 F(k+1) - F(k)),  F(2k+1) = F(k)**2 + F(k+1)**2
+    """
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a, b
+
+
+def fib_fast(n: int) -> int:
+    """F(n) in O(log n) big-integer steps, no recursion and no cache."""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    return _fib_pair(n)[0]
+
+
+def fib_many(ns: Iterable[int]) -> np.ndarray:
+    """F(n) for every n in ``ns``, in order, computed in one ascending pass.
+
+    Distinct indices are sorted; each one is reached from the previous via
+    F(m+d) = F(m) F(d+1) + (F(m+1) - F(m)) F(d) and
+    F(m+d+1) = F(m+1) F(d+1) + F(m) F(d), so only the gaps are doubled.
+    The result is int64 if every value fits (n <= 92), else an object
+    array of Python ints.
+    """
+    import numpy as np
+
+    idx = np.asarray(list(ns), dtype=np.int64)
+    if idx.size and idx.min() < 0:
+        raise ValueError("indices must be non-negative")
+    if idx.size == 0 or idx.max() <= INT64_MAX_FIB:
+        table = np.zeros(INT64_MAX_FIB + 1, dtype=np.int64)
+        table[1] = 1
+        for k in range(2, int(idx.max(initial=1)) + 1):
+            table[k] = table[k - 1] + table[k - 2]
+        return table[idx]
+    uniq, inverse = np.unique(idx, return_inverse=True)
+    values = np.empty(uniq.size, dtype=object)
+    m, fm, fm1 = 0, 0, 1  # current index and (F(m), F(m + 1))
+    for i, target in enumerate(uniq.tolist()):
+        if target != m:
+            fd, fd1 = _fib_pair(target - m)
+            fm, fm1 = fm * fd1 + (fm1 - fm) * fd, fm1 * fd1 + fm * fd
+            m = target
+        values[i] = fm
+    return values[inverse]
+
+
+def benchmark(calls: int = 200_000, threads: int = 4) -> None:
+    """Time cache hits and a mixed workload for memoize vs lru_cache."""
+    def square(x: int) -> int:
+        return x * x
+
+    keys = [i % 1_000 for i in range(calls)]  # 1,000 distinct keys
+    print(f"{'cache':24} {'hits only':>12} {'mixed':>12} {'threaded':>12}")
+    for name, make in (("functools.lru_cache", lambda: lru_cache(maxsize=512)(square)),
+                       ("memoize", lambda: memoize(square, maxsize=512)),
+                       ("memoize (ttl=60s)", lambda: memoize(square, maxsize=512, ttl=60))):
+        f = make()
+        f(1)
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            f(1)
+        hit = (time.perf_counter() - t0) / calls
+
+        f = make()  # 1,000 keys cycling through 512 slots: misses and evictions
+        t0 = time.perf_counter()
+        for k in keys:
+            f(k)
+        mixed = (time.perf_counter() - t0) / calls
+
+        f = make()
+        workers = [threading.Thread(target=lambda: [f(k % 256) for k in keys])
+                   for _ in range(threads)]
+        t0 = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        threaded = (time.perf_counter() - t0) / (calls * threads)
+        print(f"{name:24} {hit * 1e9:9.0f} ns {mixed * 1e9:9.0f} ns "
+              f"{threaded * 1e9:9.0f} ns   {f.cache_info()}")
+
+
+def benchmark_fib(ns: Iterable[int] = (100, 400, 5_000, 100_000, 300_000)) -> None:
+    """Time and peak memory of fib (memoized) vs fib_fast, and of 100
+    indices up to n via a fib_fast loop vs one fib_many call."""
+    def measure(func, *args) -> str:
+        try:
+            t0 = time.perf_counter()
+            func(*args)
+            dt = time.perf_counter() - t0
+            tracemalloc.start()  # separate run: tracing slows allocations
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        except RecursionError:
+            return "RecursionError"
+        finally:
+            tracemalloc.stop()
+        return f"{dt * 1e3:8.2f} ms {peak / 1024:7.0f} KiB"
+
+    def memoized(n: int) -> int:
+        fib.cache_clear()
+        return fib(n)
+
+    print(f"{'n':>8}  {'fib (memoized)':>22}  {'fib_fast':>22}  "
+          f"{'100 x fib_fast':>22}  {'fib_many (100)':>22}")
+    for n in ns:
+        batch = range(n // 100, n + 1, max(1, n // 100))
+        cells = [measure(memoized, n) if n <= 5_000 else "skipped",
+                 measure(fib_fast, n),
+                 measure(lambda: [fib_fast(k) for k in batch]),
+                 measure(fib_many, batch)]
+        print(f"{n:>8}  " + "  ".join(f"{c:>22}" for c in cells))
+
+
 def main() -> None:
     print("vol_sphere(2.0)=", vol_sphere(2.0))
     print("fib(10)=", fib(10))
+    print("fib.cache_info()=", fib.cache_info())
+    print("fib_fast(5000) has", len(str(fib_fast(5000))), "digits")
+    if "--bench" in sys.argv[1:]:
+        print("fib_many([10, 1, 90])=", fib_many([10, 1, 90]))
+        benchmark()
+        benchmark_fib()
 
 
 if __name__ == "__main__":
     main()
-
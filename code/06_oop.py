@@ -3,10 +3,22 @@
 # (c) Dr. Yves J. Hilpisch
 # AI-Powered by GPT-5
 
-"""Chapter 6 — Lightweight classes and equality semantics."""
+"""Chapter 6 — Lightweight classes and equality semantics.
+
+Run with ``--bench`` to try ``MoneyArray`` and compare it with lists of
+``Money``/``SlotMoney`` (memory and summing throughput). NumPy is only
+imported by ``MoneyArray``, so the plain chapter starts without it.
+"""
 
 from __future__ import annotations
+import sys
+import time
+import tracemalloc
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 @dataclass(frozen=True)
@@ -24,13 +36,189 @@ class Money:
         return Money(self.amount + other.amount, self.currency)
 
 
+@dataclass(frozen=True, slots=True)
+class SlotMoney:
+    """``Money`` without a per-instance ``__dict__``; additions skip the
+    (redundant) validation, since a sum of valid amounts is valid."""
+
+    amount: float
+    currency: str = "USD"
+
+    def __post_init__(self) -> None:
+        if self.amount < 0:
+            raise ValueError("amount must be >= 0")
+
+    def __add__(self, other: "SlotMoney") -> "SlotMoney":
+        if self.currency != other.currency:
+            raise ValueError("currency mismatch")
+        new = object.__new__(SlotMoney)
+        object.__setattr__(new, "amount", self.amount + other.amount)
+        object.__setattr__(new, "currency", self.currency)
+        return new
+
+
+class MoneyArray:
+    """Many amounts as int64 minor units (cents) plus uint8 currency codes.
+
+    Validation and currency checks run once per batch, not per element.
+    Sums are exact integer sums of minor units.
+    """
+
+    MINOR = 100  # minor units per major unit
+
+    def __init__(self, units: np.ndarray, codes: np.ndarray,
+                 currencies: Sequence[str]) -> None:
+        import numpy as np
+
+        self.units = np.asarray(units, dtype=np.int64)
+        self.currencies = tuple(currencies)  # code -> currency
+        if len(self.currencies) > 256:
+            raise ValueError("at most 256 currencies")
+        codes = np.asarray(codes)
+        if codes.size and (codes.min() < 0 or codes.max() >= len(self.currencies)):
+            raise ValueError("currency code out of range")  # before the uint8 cast
+        self.codes = codes.astype(np.uint8)
+        if self.units.shape != self.codes.shape:
+            raise ValueError("units and codes differ in shape")
+        if self.units.size and self.units.min() < 0:
+            raise ValueError("amount must be >= 0")
+
+    @classmethod
+    def from_amounts(cls, amounts, currencies="USD") -> "MoneyArray":
+        """From major-unit amounts and one currency or one per amount."""
+        import numpy as np
+
+        scaled = np.asarray(amounts, dtype=np.float64) * cls.MINOR
+        if not np.isfinite(scaled).all():  # checked before the int64 cast
+            raise ValueError("amounts must be finite")
+        if np.abs(scaled).max(initial=0.0) >= 2.0**63:
+            raise ValueError("amount out of range for int64 minor units")
+        units = np.rint(scaled)
+        if isinstance(currencies, str):
+            return cls(units, np.zeros(units.shape, np.uint8), (currencies,))
+        table, codes = np.unique(np.asarray(currencies), return_inverse=True)
+        return cls(units, codes, [str(c) for c in table])
+
+    @classmethod
+    def from_money(cls, items: Iterable[Money]) -> "MoneyArray":
+        items = list(items)
+        return cls.from_amounts([m.amount for m in items],
+                                [m.currency for m in items])
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def __getitem__(self, i: int) -> Money:
+        return Money(int(self.units[i]) / self.MINOR,
+                     self.currencies[self.codes[i]])
+
+    def __repr__(self) -> str:
+        return (f"MoneyArray(n={len(self)}, currencies={list(self.currencies)}, "
+                f"nbytes={self.nbytes})")
+
+    @property
+    def nbytes(self) -> int:
+        return self.units.nbytes + self.codes.nbytes
+
+    def _codes_for(self, currencies: Sequence[str]) -> np.ndarray:
+        """Own codes translated into the table ``currencies`` (-1 if absent)."""
+        import numpy as np
+
+        lookup = np.array([currencies.index(c) if c in currencies else -1
+                           for c in self.currencies], dtype=np.int16)
+        return lookup[self.codes]
+
+    def __add__(self, other: "MoneyArray") -> "MoneyArray":
+        import numpy as np
+
+        if len(self) != len(other):
+            raise ValueError(f"length mismatch: {len(self)} vs {len(other)}")
+        codes = (other.codes if other.currencies == self.currencies
+                 else other._codes_for(self.currencies))
+        if not np.array_equal(self.codes, codes):  # one check for the batch
+            raise ValueError("currency mismatch")
+        return MoneyArray(self.units + other.units, self.codes, self.currencies)
+
+    def sum(self) -> Money:
+        """Total of a single-currency array (zero for an empty one, in its
+        first currency or ``Money``'s default)."""
+        import numpy as np
+
+        used = np.unique(self.codes)
+        if len(used) > 1:
+            raise ValueError("currency mismatch; use sum_by_currency()")
+        if len(used):
+            currency = self.currencies[used[0]]
+        else:
+            currency = self.currencies[0] if self.currencies else Money.currency
+        return Money(int(self.units.sum()) / self.MINOR, currency)
+
+    def sum_by_currency(self) -> Dict[str, Money]:
+        """Totals per currency (exact integer sums)."""
+        import numpy as np
+
+        order = np.argsort(self.codes, kind="stable")
+        codes = self.codes[order]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else []
+        totals = np.add.reduceat(self.units[order], starts) if len(codes) else []
+        return {self.currencies[codes[s]]: Money(int(t) / self.MINOR,
+                                                 self.currencies[codes[s]])
+                for s, t in zip(starts, totals)}
+
+
+def benchmark(n: int = 1_000_000) -> None:
+    """Memory and summing time: list[Money], list[SlotMoney], MoneyArray."""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    amounts = np.round(rng.uniform(0, 100, n), 2)
+    cur = np.where(rng.random(n) < 0.8, "USD", "EUR")
+
+    pairs = list(zip(amounts.tolist(), cur.tolist()))
+
+    def build_list(cls):
+        return [cls(a, c) for a, c in pairs]
+
+    def total(items):
+        acc = {}
+        for m in items:
+            acc[m.currency] = acc[m.currency] + m if m.currency in acc else m
+        return acc
+
+    print(f"{n:,} amounts (USD/EUR)   {'build':>10} {'memory':>10} {'sum by ccy':>11}")
+    for name, cls in (("list[Money]", Money), ("list[SlotMoney]", SlotMoney)):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        items = build_list(cls)
+        t_build = time.perf_counter() - t0
+        mem = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        t0 = time.perf_counter()
+        total(items)
+        t_sum = time.perf_counter() - t0
+        print(f"  {name:22} {t_build:9.3f}s {mem / 2**20:7.1f} MiB {t_sum:10.3f}s")
+        del items
+    t0 = time.perf_counter()
+    arr = MoneyArray.from_amounts(amounts, cur)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    arr.sum_by_currency()
+    t_sum = time.perf_counter() - t0
+    print(f"  {'MoneyArray':22} {t_build:9.3f}s {arr.nbytes / 2**20:7.1f} MiB "
+          f"{t_sum:10.3f}s")
+
+
 def main() -> None:
     a = Money(10, "USD")
     b = Money(5, "USD")
     print("a + b =", a + b)
     print("equality:", Money(10, "USD") == Money(10, "USD"))
+    print("slots:", SlotMoney(10, "USD") + SlotMoney(5, "USD"))
+    if "--bench" in sys.argv[1:]:
+        arr = MoneyArray.from_amounts([10, 5, 2.5], ["USD", "EUR", "USD"])
+        print(arr, "->", arr.sum_by_currency())
+        benchmark()
 
 
 if __name__ == "__main__":
     main()
-
@@ -3,9 +3,25 @@
 # (c) Dr. Yves J. Hilpisch
 # AI-Powered by GPT-5
 
-"""Chapter 7 — Idiomatic Python patterns."""
+"""Chapter 7 — Idiomatic Python patterns.
+
+Run with ``--bench`` to try the chunked bulk price parser and compare it
+with per-record ``eafp_get_price`` on one million NDJSON lines. NumPy is
+only imported by the bulk parser, so the plain chapter starts without it.
+"""
 
 from __future__ import annotations
+import io
+import json
+import re
+import sys
+import time
+from collections import Counter
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def eafp_get_price(record: dict) -> float | None:
@@ -15,13 +31,140 @@ def eafp_get_price(record: dict) -> float | None:
         return None
 
 
+# What float() accepts from a string: digits with optional underscores,
+# decimal point, exponent, inf/infinity/nan, surrounding whitespace.
+_DIGITS = r"\d(?:_?\d)*"
+FLOAT_TEXT = re.compile(
+    rf"\s*[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})"
+    rf"(?:[eE][+-]?{_DIGITS})?|inf(?:inity)?|nan)\s*", re.IGNORECASE)
+
+
+def chunks(lines: Iterable[str], size: int = 10_000) -> Iterator[list[str]]:
+    """Non-blank lines in lists of at most ``size``."""
+    it = (line for line in lines if line.strip())
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+_scan = json.JSONDecoder().scan_once  # one value at an offset, no wrapper
+
+
+def _records(chunk: list[str], bad: Counter) -> list:
+    """Decode a chunk of JSON lines, exactly one value per line.
+
+    Each line, stripped of JSON whitespace, goes straight to the decoder's
+    scanner, which skips the per-call overhead of ``json.loads``. Lines it
+    does not take as exactly one value (trailing data, errors) are retried
+    with ``json.loads``, so the result equals decoding each line on its own.
+    Lines that do not decode become ``None``.
+    """
+    records = []
+    for line in chunk:
+        try:
+            value, end = _scan(stripped := line.strip(" \t\n\r"), 0)
+            if end == len(stripped):
+                records.append(value)
+                continue
+        except (StopIteration, ValueError):
+            pass
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            bad["invalid_json"] += 1
+            records.append(None)
+    return records
+
+
+def price_chunks(lines: Iterable[str], size: int = 10_000,
+                 bad: Counter | None = None) -> Iterator[np.ndarray]:
+    """Prices of NDJSON ``lines`` as float64 arrays, one per chunk.
+
+    Same values as ``eafp_get_price`` per record, NaN where it would return
+    ``None``, but no exception per bad row: numbers are taken as they are
+    and strings are converted in bulk (if a chunk holds bad strings, they
+    are first filtered with a regular expression). Bad rows are counted in
+    ``bad`` by reason (invalid_json, missing, unparseable). Memory is
+    bounded by ``size``. Unlike ``eafp_get_price``, which raises
+    ``TypeError`` for them, a ``null`` price counts as missing and any other
+    non-number, non-string price (list, object) as unparseable.
+    """
+    import numpy as np
+
+    bad = Counter() if bad is None else bad
+    for chunk in chunks(lines, size):
+        broken = bad["invalid_json"]
+        records = _records(chunk, bad)
+        broken = bad["invalid_json"] - broken
+        raw = [r.get("price") if isinstance(r, dict) else None for r in records]
+        prices = np.full(len(raw), np.nan)
+        num = [i for i, v in enumerate(raw) if isinstance(v, (int, float))]
+        prices[num] = [raw[i] for i in num]
+        txt = [i for i, v in enumerate(raw) if isinstance(v, str)]
+        try:  # usually every string is a number: one bulk conversion
+            prices[txt] = np.array([raw[i] for i in txt], dtype=str).astype(np.float64)
+        except ValueError:  # else keep those float() would accept
+            txt = [i for i in txt if FLOAT_TEXT.fullmatch(raw[i])]
+            prices[txt] = np.array([raw[i] for i in txt], dtype=str).astype(np.float64)
+        missing = raw.count(None) - broken
+        bad["missing"] += missing
+        bad["unparseable"] += len(raw) - len(num) - len(txt) - missing - broken
+        yield prices
+
+
+def parse_prices(lines: Iterable[str], size: int = 10_000
+                 ) -> tuple[np.ndarray, Counter]:
+    """All prices as one float64 array plus bad-row counts."""
+    import numpy as np
+
+    bad: Counter = Counter()
+    parts = list(price_chunks(lines, size, bad))
+    return (np.concatenate(parts) if parts else np.empty(0)), bad
+
+
+def benchmark(n: int = 1_000_000, size: int = 10_000) -> None:
+    """Per-record json.loads + eafp_get_price vs the chunked bulk parser."""
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    kinds = rng.choice(4, n, p=[0.80, 0.15, 0.03, 0.02])
+    values = rng.uniform(1, 500, n).round(2)
+    make = (lambda v: f'{{"price": {v}}}', lambda v: f'{{"price": "{v}"}}',
+            lambda v: '{"price": "n/a"}', lambda v: '{"sku": 1}')
+    text = "\n".join(make[k](v) for k, v in zip(kinds.tolist(), values.tolist()))
+
+    t0 = time.perf_counter()
+    slow = [eafp_get_price(json.loads(line)) for line in io.StringIO(text)]
+    t_slow = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    total = count = 0.0
+    bad: Counter = Counter()
+    for prices in price_chunks(io.StringIO(text), size, bad):  # streaming
+        ok = ~np.isnan(prices)
+        total += prices[ok].sum()
+        count += ok.sum()
+    t_fast = time.perf_counter() - t0
+
+    expected = np.array([np.nan if p is None else p for p in slow])
+    same = np.array_equal(parse_prices(io.StringIO(text), size)[0], expected,
+                          equal_nan=True)
+    print(f"{n:,} records: per-record {t_slow:.2f}s, chunked {t_fast:.2f}s "
+          f"({t_slow / t_fast:.1f}x); mean price {total / count:.2f}; "
+          f"bad rows {dict(bad)}; identical values: {same}")
+
+
 def main() -> None:
     xs = [x * x for x in range(6) if x % 2 == 0]
     print("even squares:", xs)
     print("safe price:", eafp_get_price({"price": "101.5"}))
     print("bad price:", eafp_get_price({"price": "n/a"}))
+    if "--bench" in sys.argv[1:]:
+        ndjson = io.StringIO('{"price": 101.5}\n{"price": "99"}\n{"price": "n/a"}\n'
+                             '{"sku": 7}\nnot json\n')
+        prices, bad = parse_prices(ndjson, size=2)
+        print("bulk prices:", prices, "bad rows:", dict(bad))
+        benchmark()
 
 
 if __name__ == "__main__":
     main()
-
@@ -9,11 +9,31 @@ Features
 - Discovers Python scripts (NN_*.py) and runs them with the current interpreter.
 - Optionally runs bash scripts (NN_*.sh) with PRIMER_DRY_RUN=1 for safety.
 - Captures return codes and durations; prints a compact summary.
+- Reads output incrementally with bounded memory (head + tail kept); can
+  echo lines live (--stream) and keep full logs (--log-dir).
+- Optional warm mode: one parent pre-imports numpy/pandas/matplotlib/sklearn
+  and forks an isolated child per script, saving the per-script import cost.
+- Records CPU time, peak RSS, page faults and I/O bytes per script.
+- Optional CPU profiling (--profile): per-script .pstats and collapsed
+  stacks in tools/_profiles/ (see tools/profiling.py), top functions in the
+  summary.
+- Reuses passing results of unchanged scripts from the shared result cache
+  in tools/_cache/ (see tools/result_cache.py).
+- Watch mode (--watch): waits for saves in code/ and notebooks/ (inotify on
+  Linux, polling elsewhere; see tools/watcher.py) and re-runs only the
+  affected scripts and notebooks on warm workers: forked from a
+  single-threaded server with the heavy libraries preloaded, notebooks on a
+  recycled kernel.
 
 Usage
   python code/run_all.py                 # run Python scripts only
   python code/run_all.py --with-bash     # also run bash scripts (dry-run)
   python code/run_all.py --list          # list discovered scripts
+  python code/run_all.py --warm          # preload libraries, fork per script
+  python code/run_all.py --profile       # cProfile each script, list hot spots
+  python code/run_all.py --refresh       # ignore cached results, re-run all
+  python code/run_all.py --no-cache      # neither read nor write the cache
+  python code/run_all.py --watch         # re-run what each save affects
 
 Environment
   MPLBACKEND=Agg is set for headless plotting.
@@ -23,24 +43,53 @@ Environment
 from __future__ import annotations
 
 import argparse
+import ast
+import asyncio
+import importlib
 import os
+import pickle
+import runpy
+import signal
+import socket
 import subprocess as sp
 import sys
+import threading
 import time
+import traceback
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 CODE_DIR = Path(__file__).resolve().parent
+NOTEBOOK_DIR = CODE_DIR.parent / "notebooks"
+EXECUTED_DIR = CODE_DIR.parent / "tools" / "_executed"
+sys.path.insert(0, str(CODE_DIR.parent / "tools"))
+
+from depgraph import affected  # noqa: E402
+from output_capture import OutputCapture, open_log, pump, run_process  # noqa: E402
+from proc_usage import Resources, wait_pid  # noqa: E402
+from profiling import (PROFILE_DIR, format_top, merge_collapsed,  # noqa: E402
+                       profile_command, run_profiled, summarize_profile)
+from result_cache import ResultCache  # noqa: E402
+from timings import item_key  # noqa: E402
+from watcher import Watcher  # noqa: E402
+
+# Heavy libraries shared by several chapters; --warm imports them once.
+WARM_MODULES = ("numpy", "pandas", "matplotlib", "matplotlib.pyplot",
+                "sklearn", "sklearn.model_selection", "sklearn.linear_model")
 
 
 @dataclass
 class Result:
     name: str
-    kind: str  # "py" or "sh"
+    kind: str  # "py", "sh" or "nb" (--watch)
     returncode: int
     duration: float
+    cached: bool = False
+    saved: float = 0.0  # estimated startup time avoided (--warm)
+    resources: Optional[Resources] = None
+    profile: Optional[dict] = None  # profiling.summarize_profile()
 
     @property
     def ok(self) -> bool:
@@ -51,30 +100,448 @@ def discover(pattern: str) -> List[Path]:
     return sorted(CODE_DIR.glob(pattern))
 
 
-def run_py(script: Path, timeout: float) -> Result:
+def _report(kind: str, script: Path, rc: int, dur: float, out: OutputCapture,
+            note: str = "") -> None:
+    print(f"[{kind}] {script.name} -> rc={rc} ({dur:.2f}s{note})")
+    if out.total and out.prefix is None:
+        print(out.text().strip())
+
+
+def _profile_out(script: Path, profile_dir: Optional[Path]) -> Optional[Path]:
+    """Output stem for a profiled run, with any stale .pstats removed."""
+    if profile_dir is None:
+        return None
+    out = profile_dir / script.stem
+    out.with_suffix(".pstats").unlink(missing_ok=True)
+    return out
+
+
+def run_py(script: Path, timeout: float, stream: bool = False,
+           log_dir: Optional[Path] = None,
+           profile_dir: Optional[Path] = None, profile_top: int = 10) -> Result:
     env = os.environ.copy()
     env.setdefault("MPLBACKEND", "Agg")
+    out_stem = _profile_out(script, profile_dir)
+    cmd = ([sys.executable, str(script)] if out_stem is None
+           else profile_command(script, out_stem))
+    log = open_log(log_dir, script.name)
+    out = OutputCapture(prefix=script.name if stream else None, log=log)
+    try:
+        proc = run_process(cmd, env, timeout, out)
+    finally:
+        if log is not None:
+            log.close()
+    _report("py", script, proc.returncode, proc.duration, out)
+    return Result(script.name, "py", proc.returncode, proc.duration,
+                  resources=proc.resources,
+                  profile=summarize_profile(out_stem, profile_top) if out_stem else None)
+
+
+def preload(modules: Iterable[str] = WARM_MODULES) -> Dict[str, float]:
+    """Import the shared heavy modules once.
+
+    Returns the incremental import time per module (in import order), which
+    is what a cold interpreter would pay again for each script using it.
+    """
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    costs: Dict[str, float] = {}
+    for name in modules:
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:  # optional dependency missing; scripts cope
+            continue
+        costs[name] = time.perf_counter() - t0
+    return costs
+
+
+def startup_saved(script: Path, costs: Dict[str, float]) -> float:
+    """Estimate the import time ``script`` avoids by running warm.
+
+    Counts the preloaded modules whose top-level package the script imports,
+    plus numpy whenever any of the heavy packages is used (they all need it).
+    """
+    try:
+        tree = ast.parse(script.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError):
+        return 0.0
+    roots = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            roots.update(a.name.split(".")[0] for a in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            roots.add(node.module.split(".")[0])
+    heavy = {m.split(".")[0] for m in costs}
+    used = roots & heavy
+    if used:
+        used.add("numpy")
+    return sum(t for m, t in costs.items() if m.split(".")[0] in used)
+
+
+def _exec_child(script: Path, out_fd: int,
+                profile_out: Optional[Path] = None) -> None:  # pragma: no cover
+    """Run ``script`` as ``__main__`` in a forked child and never return."""
+    code = 1
+    try:
+        os.dup2(out_fd, 1)
+        os.dup2(out_fd, 2)
+        os.close(out_fd)
+        if profile_out is not None:
+            code = run_profiled(script, profile_out)
+            return
+        sys.argv = [str(script)]
+        sys.path[0] = str(script.parent)
+        runpy.run_path(str(script), run_name="__main__")
+        code = 0
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            code = exc.code or 0
+        else:
+            print(exc.code, file=sys.stderr)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _send_msg(sock: socket.socket, obj, fds: Tuple[int, ...] = ()) -> None:
+    """Send ``obj`` pickled and length-prefixed, with ``fds`` attached."""
+    data = pickle.dumps(obj)
+    socket.send_fds(sock, [len(data).to_bytes(4, "big") + data], list(fds))
+
+
+def _recv_msg(sock: socket.socket):
+    """Receive one :func:`_send_msg` message as ``(obj, fds)``; None on EOF."""
+    head, fds, _, _ = socket.recv_fds(sock, 4, 1)
+    if not head:
+        return None
+    while len(head) < 4:
+        head += sock.recv(4 - len(head))
+    size = int.from_bytes(head, "big")
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError("warm server connection closed")
+        data += chunk
+    return pickle.loads(data), fds
+
+
+class WarmServer:
+    """Single-threaded process that forks the warm script children (--watch).
+
+    Forking a process that runs other threads (the kernel pool's client, the
+    output readers) can leave the child stuck on a lock one of them held, so
+    --watch starts this server right after :func:`preload`, while it is still
+    single-threaded, and has it do all later forks. Requests and results
+    travel over a socket pair; the write end of each script's output pipe is
+    passed along with the request. The server exits once its end of the
+    socket reports EOF.
+    """
+
+    def __init__(self) -> None:
+        self._sock, theirs = socket.socketpair()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.pid = os.fork()
+        if self.pid == 0:  # pragma: no cover - server
+            self._sock.close()
+            self._serve(theirs)
+        theirs.close()
+        self._running: Optional[int] = None
+
+    @staticmethod
+    def _serve(sock: socket.socket) -> None:  # pragma: no cover - server
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # stopped by close()
+        code = 0
+        try:
+            while True:
+                msg = _recv_msg(sock)
+                if msg is None:  # parent closed its end (or exited)
+                    break
+                (script, profile_out), fds = msg
+                pid = os.fork()
+                if pid == 0:
+                    sock.close()
+                    signal.signal(signal.SIGINT, signal.default_int_handler)
+                    _exec_child(script, fds[0], profile_out)
+                os.close(fds[0])
+                _send_msg(sock, pid)
+                status, usage, _ = wait_pid(pid, None)  # no timer thread here
+                _send_msg(sock, (status, usage))
+        except (BrokenPipeError, ConnectionResetError, EOFError):
+            pass  # parent went away mid-run (Ctrl+C)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+
+    def start(self, script: Path, out_fd: int,
+              profile_out: Optional[Path] = None) -> int:
+        """Fork a child running ``script`` with output to ``out_fd``; return its pid."""
+        _send_msg(self._sock, (script, profile_out), (out_fd,))
+        self._running = _recv_msg(self._sock)[0]
+        return self._running
+
+    def wait(self, pid: int, timeout: Optional[float]) -> Tuple[int, Resources, bool]:
+        """Like :func:`wait_pid` for a child of :meth:`start`."""
+        timed_out = False
+        self._sock.settimeout(timeout or None)
+        try:
+            msg = _recv_msg(self._sock)
+        except socket.timeout:
+            timed_out = True
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            self._sock.settimeout(None)
+            msg = _recv_msg(self._sock)
+        finally:
+            self._sock.settimeout(None)
+        self._running = None
+        status, usage = msg[0]
+        return status, usage, timed_out
+
+    def close(self) -> None:
+        """Stop the server, killing a script still running (Ctrl+C)."""
+        if self._running is not None:
+            try:
+                os.kill(self._running, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self._sock.close()
+        os.waitpid(self.pid, 0)
+
+
+def run_py_warm(script: Path, timeout: float,
+                costs: Optional[Dict[str, float]] = None,
+                stream: bool = False,
+                log_dir: Optional[Path] = None,
+                profile_dir: Optional[Path] = None,
+                profile_top: int = 10,
+                server: Optional[WarmServer] = None) -> Result:
+    """Fork the (pre-warmed) runner and execute ``script`` in the child.
+
+    The child inherits the already imported numpy/pandas/matplotlib/sklearn
+    modules but gets a fresh ``__main__`` namespace via :mod:`runpy`; any
+    state it creates dies with it. Output (stdout+stderr) comes back through
+    a pipe and is captured like in :func:`run_py`. Note that the child's peak
+    RSS includes the preloaded pages it shares with the parent. With
+    ``server`` the child is forked by that :class:`WarmServer` instead.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    out_stem = _profile_out(script, profile_dir)
+    r, w = os.pipe()
     t0 = time.perf_counter()
-    proc = sp.run([sys.executable, str(script)], env=env, stdout=sp.PIPE,
-                  stderr=sp.STDOUT, timeout=timeout, text=True)
+    if server is not None:
+        pid = server.start(script, w, out_stem)
+    else:
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - child
+            os.close(r)
+            _exec_child(script, w, out_stem)
+    os.close(w)
+    log = open_log(log_dir, script.name)
+    out = OutputCapture(prefix=script.name if stream else None, log=log)
+    reader = threading.Thread(target=pump, args=(os.fdopen(r, "rb"), out),
+                              daemon=True)
+    reader.start()
+    try:
+        if server is not None:
+            status, usage, timed_out = server.wait(pid, timeout)
+        else:
+            status, usage, timed_out = wait_pid(pid, timeout)
+        reader.join(timeout=5)
+        if timed_out:
+            raise sp.TimeoutExpired(str(script), timeout, output=out.text())
+    finally:
+        if log is not None:
+            log.close()
+    rc = os.waitstatus_to_exitcode(status)
     dur = time.perf_counter() - t0
-    print(f"[py] {script.name} -> rc={proc.returncode} ({dur:.2f}s)")
-    if proc.stdout:
-        print(proc.stdout.strip()[:10_000])
-    return Result(script.name, "py", proc.returncode, dur)
+    saved = startup_saved(script, costs or {})
+    _report("py", script, rc, dur, out,
+            f", warm, ~{saved:.2f}s startup saved")
+    return Result(script.name, "py", rc, dur, saved=saved, resources=usage,
+                  profile=summarize_profile(out_stem, profile_top) if out_stem else None)
 
 
-def run_sh(script: Path, timeout: float) -> Result:
+def run_sh(script: Path, timeout: float, stream: bool = False,
+           log_dir: Optional[Path] = None) -> Result:
     env = os.environ.copy()
     env.setdefault("PRIMER_DRY_RUN", "1")
-    t0 = time.perf_counter()
-    proc = sp.run(["bash", str(script)], env=env, stdout=sp.PIPE,
-                  stderr=sp.STDOUT, timeout=timeout, text=True)
-    dur = time.perf_counter() - t0
-    print(f"[sh] {script.name} -> rc={proc.returncode} ({dur:.2f}s)")
-    if proc.stdout:
-        print(proc.stdout.strip()[:10_000])
-    return Result(script.name, "sh", proc.returncode, dur)
+    log = open_log(log_dir, script.name)
+    out = OutputCapture(prefix=script.name if stream else None, log=log)
+    try:
+        proc = run_process(["bash", str(script)], env, timeout, out)
+    finally:
+        if log is not None:
+            log.close()
+    _report("sh", script, proc.returncode, proc.duration, out)
+    return Result(script.name, "sh", proc.returncode, proc.duration,
+                  resources=proc.resources)
+
+
+def run_cached(script: Path, kind: str, timeout: float,
+               cache: Optional[ResultCache], refresh: bool,
+               warm: Optional[Dict[str, float]] = None,
+               stream: bool = False,
+               log_dir: Optional[Path] = None,
+               profile_dir: Optional[Path] = None,
+               profile_top: int = 10,
+               server: Optional[WarmServer] = None) -> Result:
+    if kind == "sh":
+        profile_dir = None
+    key = cache.key(script, kind) if cache else None
+    if cache and not refresh and profile_dir is None:
+        hit = cache.get(key)
+        if hit is not None:
+            print(f"[{kind}] {script.name} -> cached OK ({hit['duration']:.2f}s)")
+            return Result(script.name, kind, 0, hit["duration"], cached=True)
+    try:
+        if kind == "sh":
+            res = run_sh(script, timeout, stream, log_dir)
+        elif warm is not None:
+            res = run_py_warm(script, timeout, warm, stream, log_dir,
+                              profile_dir, profile_top, server)
+        else:
+            res = run_py(script, timeout, stream, log_dir, profile_dir,
+                         profile_top)
+    except sp.TimeoutExpired:
+        print(f"[{kind}] {script.name} timed out ({timeout}s)")
+        return Result(script.name, kind, 124, timeout)
+    if cache and res.ok:
+        cache.put(key, {"path": str(script), "kind": kind,
+                        "duration": res.duration})
+    return res
+
+
+def run_nb_warm(nb: Path, timeout: float, loop: asyncio.AbstractEventLoop,
+                pool) -> Result:
+    """Execute notebook ``nb`` on a kernel from ``pool`` (--watch)."""
+    from validate_notebooks import async_execute_notebook
+
+    try:
+        # not normalized in place: writing the notebook would re-trigger --watch
+        res = loop.run_until_complete(async_execute_notebook(
+            nb, int(timeout), pool.kernel_name, EXECUTED_DIR,
+            normalize_inplace=False, pool=pool))
+    except Exception as exc:  # timeouts, dead kernels
+        print(f"[nb] {nb.name} -> {type(exc).__name__}: {exc}")
+        return Result(nb.name, "nb", 1, timeout)
+    note = ", warm kernel" if res.warm_kernel else ""
+    print(f"[nb] {nb.name} -> {'OK' if res.ok else 'FAIL'} ({res.duration:.2f}s{note})")
+    if res.failure:
+        f = res.failure
+        print(f"  cell {f.cell_index}: {f.ename}: {f.evalue}")
+    return Result(nb.name, "nb", 0 if res.ok else 1, res.duration)
+
+
+async def _prewarm(pool) -> None:
+    pool.release(await pool.acquire(), ok=True)
+
+
+def _watch_items(with_bash: bool, notebooks: bool) -> List[Tuple[Path, str]]:
+    items = [(p, "py") for p in discover("[0-9][0-9]_*.py")]
+    if with_bash:
+        items += [(p, "sh") for p in discover("[0-9][0-9]_*.sh")]
+    if notebooks:
+        items += [(p, "nb") for p in sorted(NOTEBOOK_DIR.glob("*.ipynb"))]
+    return items
+
+
+def _print_increment(batch: List[Tuple[Result, Optional[Result], str]],
+                     latest: Dict[str, Result], since_save: float) -> None:
+    for r, prev, why in batch:
+        status = "OK" if r.ok else f"FAIL({r.returncode})"
+        was = ""
+        if prev is not None:
+            was = (f"{r.duration - prev.duration:+.2f}s" if prev.ok == r.ok
+                   else "was OK" if prev.ok else "was failing")
+        print(f"  {r.kind} {r.name:40} {status:9} {r.duration:6.2f}s {was:>12}  {why}")
+    failing = sorted(name for name, r in latest.items() if not r.ok)
+    tail = f"; failing: {', '.join(failing)}" if failing else ""
+    print(f"  {len(latest) - len(failing)}/{len(latest)} passing this session"
+          f"{tail}  [{since_save:.2f}s after save]")
+
+
+def watch(args: argparse.Namespace, cache: Optional[ResultCache]) -> int:
+    """Re-run the scripts and notebooks affected by each save until Ctrl+C.
+
+    Scripts fork from a :class:`WarmServer` started right after the heavy
+    libraries are preloaded, before the kernel pool and event loop add
+    threads (cold runs where fork is unavailable); notebooks run on one recycled
+    kernel started up front. A changed helper module or data file re-runs
+    every chapter that imports or names it (see tools/depgraph.py). Results
+    are written to the cache but never read from it, since a dependency may
+    have changed while the script itself did not.
+    """
+    costs = preload() if hasattr(os, "fork") else None
+    if costs is not None:
+        print(f"[watch] preloaded {', '.join(costs)} in {sum(costs.values()):.2f}s")
+    server = WarmServer() if costs is not None else None
+    loop = asyncio.new_event_loop()
+    pool = None
+    try:
+        from kernel_pool import KernelPool
+        import validate_notebooks  # noqa: F401 - needs nbclient
+    except Exception as exc:
+        print(f"[watch] notebooks not watched ({type(exc).__name__}: {exc})")
+    else:
+        pool = KernelPool(args.kernel)
+        t0 = time.perf_counter()
+        loop.run_until_complete(_prewarm(pool))
+        print(f"[watch] kernel {args.kernel!r} ready in {time.perf_counter() - t0:.2f}s")
+    dirs = [CODE_DIR] + ([NOTEBOOK_DIR] if pool is not None else [])
+    watcher = Watcher(dirs, (".py", ".sh", ".ipynb"))
+    print(f"[watch] watching {', '.join(d.name + '/' for d in dirs)} "
+          f"({watcher.backend}); Ctrl+C to stop")
+    latest: Dict[str, Result] = {}
+    try:
+        while True:
+            changed = watcher.wait(args.debounce)
+            items = _watch_items(args.with_bash, pool is not None)
+            kinds = {p: k for p, k in items}
+            selected, _ = affected(kinds, {item_key(p) for p in changed})
+            names = ", ".join(sorted(p.name for p in changed))
+            if not selected:
+                print(f"\n[watch] {names} saved; nothing affected")
+                continue
+            print(f"\n[watch] {time.strftime('%H:%M:%S')} {names} saved; "
+                  f"running {len(selected)} "
+                  f"({time.perf_counter() - watcher.last_event:.2f}s after save)")
+            batch = []
+            for path, why in selected:
+                if kinds[path] == "nb":
+                    res = run_nb_warm(path, args.nb_timeout, loop, pool)
+                else:
+                    res = run_cached(path, kinds[path], args.timeout, cache,
+                                     refresh=True, stream=args.stream,
+                                     log_dir=args.log_dir,
+                                     warm=costs if kinds[path] == "py" else None,
+                                     server=server)
+                batch.append((res, latest.get(res.name), why))
+                latest[res.name] = res
+            print("\nRe-run:")
+            _print_increment(batch, latest, time.perf_counter() - watcher.last_event)
+    except KeyboardInterrupt:
+        print("\n[watch] stopped")
+    finally:
+        watcher.close()
+        if pool is not None:
+            loop.run_until_complete(pool.close())
+            print(f"[watch] kernel reuse: {pool.stats.describe()}")
+        loop.close()
+        if server is not None:
+            server.close()
+    return 0 if all(r.ok for r in latest.values()) else 1
 
 
 def main(argv: Iterable[str] | None = None) -> int:
@@ -84,6 +551,34 @@ def main(argv: Iterable[str] | None = None) -> int:
     p.add_argument("--with-bash", action="store_true",
                    help="also run bash scripts (dry-run)")
     p.add_argument("--list", action="store_true", help="list scripts and exit")
+    p.add_argument("--warm", action="store_true",
+                   help="pre-import heavy libraries once and fork a child per "
+                        "Python script (POSIX only)")
+    p.add_argument("--stream", action="store_true",
+                   help="echo script output live, prefixed by script name")
+    p.add_argument("--log-dir", type=Path,
+                   help="write each script's full output to LOG_DIR/<script>.log")
+    p.add_argument("--no-cache", action="store_true",
+                   help="do not read or write the result cache")
+    p.add_argument("--refresh", action="store_true",
+                   help="re-run every script and overwrite cached results")
+    p.add_argument("--profile", action="store_true",
+                   help="run Python scripts under cProfile; writes .pstats and "
+                        "collapsed stacks per script (cache is bypassed)")
+    p.add_argument("--profile-dir", type=Path, default=PROFILE_DIR,
+                   help="where --profile writes its files (default: tools/_profiles)")
+    p.add_argument("--profile-top", type=int, default=10,
+                   help="functions to list per script with --profile (default: 10)")
+    p.add_argument("--watch", action="store_true",
+                   help="watch code/ and notebooks/ and re-run what each save "
+                        "affects on warm workers (Ctrl+C to stop)")
+    p.add_argument("--debounce", type=float, default=0.2,
+                   help="with --watch: seconds without further saves before "
+                        "running (default: 0.2)")
+    p.add_argument("--nb-timeout", type=float, default=300.0,
+                   help="with --watch: per-notebook timeout in seconds (default: 300)")
+    p.add_argument("--kernel", default="python3",
+                   help="with --watch: Jupyter kernel for notebooks (default: python3)")
     args = p.parse_args(list(argv) if argv is not None else None)
 
     pys = discover("[0-9][0-9]_*.py")
@@ -96,28 +591,53 @@ def main(argv: Iterable[str] | None = None) -> int:
             print("[sh]", s.name)
         return 0
 
+    cache = None if args.no_cache else ResultCache()
+    if cache:
+        cache.evict()
+    if args.watch:
+        return watch(args, cache)
+    warm = args.warm and hasattr(os, "fork")
+    if args.warm and not warm:
+        print("--warm needs os.fork(); running scripts cold instead")
+    costs = preload() if warm else None
+    preload_time = sum(costs.values()) if costs else 0.0
+    if warm:
+        print(f"[warm] preloaded {', '.join(costs)} in {preload_time:.2f}s")
+    profile_dir = args.profile_dir if args.profile else None
     results: List[Result] = []
     for s in pys:
-        try:
-            results.append(run_py(s, args.timeout))
-        except sp.TimeoutExpired:
-            print(f"[py] {s.name} timed out ({args.timeout}s)")
-            results.append(Result(s.name, "py", 124, args.timeout))
-
+        results.append(run_cached(s, "py", args.timeout, cache, args.refresh,
+                                  costs, args.stream, args.log_dir,
+                                  profile_dir, args.profile_top))
     for s in shs:
-        try:
-            results.append(run_sh(s, args.timeout))
-        except sp.TimeoutExpired:
-            print(f"[sh] {s.name} timed out ({args.timeout}s)")
-            results.append(Result(s.name, "sh", 124, args.timeout))
+        results.append(run_cached(s, "sh", args.timeout, cache, args.refresh,
+                                  None, args.stream, args.log_dir))
 
     # Summary
     ok = sum(r.ok for r in results)
     total = len(results)
     print("\nSummary:")
     for r in results:
-        status = "OK" if r.ok else f"FAIL({r.returncode})"
-        print(f"  {r.kind} {r.name:28} {status:10} {r.duration:6.2f}s")
+        status = "OK(cached)" if r.cached else "OK" if r.ok else f"FAIL({r.returncode})"
+        usage = f"  {r.resources.columns()}" if r.resources else ""
+        print(f"  {r.kind} {r.name:28} {status:10} {r.duration:6.2f}s{usage}")
+    if warm:
+        forked = [r for r in results if r.kind == "py" and not r.cached]
+        run_time = sum(r.duration for r in forked)
+        saved = sum(r.saved for r in forked)
+        print(f"\nWarm mode: {len(forked)} scripts ran in {run_time:.2f}s; "
+              f"est. startup saved {saved:.2f}s "
+              f"(net {saved - preload_time:.2f}s after {preload_time:.2f}s preload)")
+    profiled = [r for r in results if r.profile]
+    if profiled:
+        print("\nCPU profile (top functions by cumulative time):")
+        for r in profiled:
+            print(f"  {r.name}  ->  {r.profile['pstats']}")
+            print("\n".join(format_top(r.profile["top"])))
+        merged = args.profile_dir / "run_all.collapsed"
+        merge_collapsed(merged, [(r.name, Path(r.profile["collapsed"]))
+                                 for r in profiled])
+        print(f"  collapsed stacks (all scripts): {merged}")
     print(f"\nPassed {ok}/{total} scripts")
     return 0 if ok == total else 1
 
@@ -0,0 +1,10 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Make tools/ importable the way the tools import each other."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
@@ -0,0 +1,41 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Kernel-less engine: trailing results keep their rich representations."""
+
+import pytest
+
+from nb_inproc import run_cells
+
+
+def _result_data(source: str) -> dict:
+    result = run_cells([{"index": 0, "source": source}])
+    assert result["error"] is None
+    [out] = [o for o in result["cells"][0]["outputs"]
+             if o["output_type"] == "execute_result"]
+    return out["data"]
+
+
+def test_dataframe_trailing_expression_keeps_html():
+    pd = pytest.importorskip("pandas")
+    data = _result_data("import pandas as pd\npd.DataFrame({'a': [1, 2]})")
+    df = pd.DataFrame({"a": [1, 2]})
+    assert data == {"text/html": df._repr_html_(), "text/plain": repr(df)}
+
+
+def test_repr_methods_and_mimebundle():
+    data = _result_data(
+        "class Rich:\n"
+        "    def _repr_mimebundle_(self): return {'text/markdown': '*x*'}\n"
+        "    def _repr_html_(self): return '<b>x</b>'\n"
+        "    def _repr_png_(self): return b'png'\n"
+        "    def _repr_svg_(self): return None\n"
+        "    def __repr__(self): return 'Rich()'\n"
+        "Rich()")
+    assert data == {"text/markdown": "*x*", "text/html": "<b>x</b>",
+                    "image/png": "cG5n", "text/plain": "Rich()"}
+
+
+def test_plain_values_are_text_only():
+    assert _result_data("1 + 1") == {"text/plain": "2"}
@@ -0,0 +1,52 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Pre-flight compiles valid Python as is and only rewrites IPython syntax."""
+
+import ast
+import json
+
+import pytest
+
+pytest.importorskip("nbclient")
+from validate_notebooks import _neutralize_ipython, preflight  # noqa: E402
+
+# valid Python that line-based magic/help detection used to break
+COMMENT_QUESTION = "for i in range(3):  # loop?\n    print(i)\n"
+DOCSTRING_QUESTION = 'text = """What is this?\nNothing."""\n'
+CONTINUED_NE = "ok = (1\n!= 2)\n"
+VALID = [COMMENT_QUESTION, DOCSTRING_QUESTION, CONTINUED_NE]
+
+
+def _notebook(tmp_path, *sources):
+    path = tmp_path / "nb.ipynb"
+    cells = [{"cell_type": "code", "metadata": {}, "outputs": [],
+              "execution_count": None, "source": s} for s in sources]
+    path.write_text(json.dumps({"cells": cells, "metadata": {},
+                                "nbformat": 4, "nbformat_minor": 5}))
+    return path
+
+
+@pytest.mark.parametrize("source", VALID)
+def test_valid_python_passes(tmp_path, source):
+    assert preflight(_notebook(tmp_path, source)) is None
+
+
+@pytest.mark.parametrize("source", VALID)
+def test_valid_python_next_to_magics_passes(tmp_path, source):
+    # the magic forces the rewrite path for the whole cell
+    assert preflight(_notebook(tmp_path, "%time x = 1\n" + source)) is None
+
+
+@pytest.mark.parametrize("source", VALID)
+def test_fallback_rewrite_keeps_valid_python(source):
+    code = _neutralize_ipython("!ls\nobj?\n" + source)
+    ast.parse(code)
+    assert code.splitlines()[2:] == source.splitlines()
+
+
+def test_ipython_syntax_passes_and_errors_fail(tmp_path):
+    assert preflight(_notebook(tmp_path, "files = !ls\nlen?\n%matplotlib inline")) is None
+    failure = preflight(_notebook(tmp_path, "x = 1", "def f(:\n    pass"))
+    assert failure is not None and failure.cell_index == 1
@@ -0,0 +1,77 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Timing statistics and baseline comparison for repeated script runs.
+
+A baseline is a JSON file mapping script names to their timing statistics:
+
+    {"python": "3.11.7 ...", "created": 1700000000.0,
+     "scripts": {"08_numpy_essentials.py": {"min": 0.12, "median": 0.13, ...}}}
+
+A script regresses when the chosen statistic (median by default) grew by
+more than the relative threshold versus the baseline.
+
+Used by tools/validate_code.py --bench.
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """min/median/p95/mean/stdev (seconds) and the sample count."""
+    xs = sorted(samples)
+    n = len(xs)
+    # nearest-rank percentile: robust and well defined for small n
+    p95 = xs[max(0, math.ceil(0.95 * n) - 1)]
+    return {
+        "n": n,
+        "min": xs[0],
+        "median": statistics.median(xs),
+        "p95": p95,
+        "mean": statistics.fmean(xs),
+        "stdev": statistics.stdev(xs) if n > 1 else 0.0,
+    }
+
+
+def save_baseline(path: Path, stats: Dict[str, Dict[str, float]]) -> None:
+    payload = {"python": sys.version, "created": time.time(), "scripts": stats}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2))
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, float]]:
+    return json.loads(path.read_text()).get("scripts", {})
+
+
+def compare(current: Dict[str, float], baseline: Optional[Dict[str, float]],
+            threshold: float, stat: str = "median") -> Optional[float]:
+    """Relative change of ``stat`` versus the baseline (``None`` if unknown).
+
+    A return value above ``threshold`` is a regression.
+    """
+    if not baseline or not baseline.get(stat):
+        return None
+    return current[stat] / baseline[stat] - 1.0
+
+
+def format_row(name: str, stats: Dict[str, float],
+               change: Optional[float] = None, threshold: float = 0.0) -> str:
+    delta = ""
+    if change is not None:
+        flag = "  REGRESSION" if change > threshold else ""
+        delta = f"  {change:+7.1%}{flag}"
+    return (f"  {name:28} min {stats['min']:7.3f}s  med {stats['median']:7.3f}s  "
+            f"p95 {stats['p95']:7.3f}s  sd {stats['stdev']:6.3f}s  "
+            f"n={stats['n']}{delta}")
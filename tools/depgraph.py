@@ -0,0 +1,202 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Select the chapter scripts and notebooks affected by a change.
+
+:func:`changed_files` lists the files that differ from a git ref
+(committed, staged and unstaged; untracked files are ignored, since the
+chapters write figures and other outputs into the tree). :func:`dependencies`
+builds a static dependency set for a script or notebook:
+- the file itself,
+- local modules it imports, resolved next to it and at the repository root
+  and followed transitively, and
+- tracked repository files named by string literals (data, configs); files
+  the chapters merely write are not tracked and so never count as inputs.
+
+Requirements files (``requirements*.txt`` and friends) affect every item.
+Magics and shell escapes in notebooks are ignored; bash scripts contribute
+the file names they mention.
+
+Used by tools/validate_code.py and tools/validate_notebooks.py
+(--changed-since).
+
+Requirements
+  Standard library only (and git on PATH).
+"""
+
+from __future__ import annotations
+
+import ast
+import fnmatch
+import json
+import re
+import subprocess as sp
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from timings import ROOT, item_key
+
+
+GLOBAL_PATTERNS = ("requirements*.txt", "environment*.yml", "pyproject.toml",
+                   "setup.py", "setup.cfg")
+_PATH_TOKEN = re.compile(r"[\w./-]+\.\w+")
+
+
+class GitError(RuntimeError):
+    pass
+
+
+def _git(*args: str) -> str:
+    proc = sp.run(["git", "-C", str(ROOT), *args], capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise GitError(proc.stderr.strip() or f"git {' '.join(args)} failed")
+    return proc.stdout
+
+
+def changed_files(ref: str) -> Set[str]:
+    """Item keys (see :func:`timings.item_key`) of tracked files changed
+    since ``ref``.
+
+    git reports paths relative to its top level, which is not ROOT when
+    this tree lives inside a larger repository, so they are resolved
+    against it first. New files count once added to the index (``git add``).
+    """
+    top = Path(_git("rev-parse", "--show-toplevel").strip())
+    return {item_key(top / f)
+            for f in _git("diff", "--name-only", ref, "--").splitlines()}
+
+
+def tracked_files() -> Optional[Set[Path]]:
+    """Resolved paths of all files git tracks (``None`` without git)."""
+    try:
+        return {(ROOT / f).resolve() for f in _git("ls-files").splitlines()}
+    except (GitError, OSError):
+        return None
+
+
+def _python_sources(path: Path) -> List[str]:
+    text = path.read_text(encoding="utf-8", errors="replace")
+    if path.suffix != ".ipynb":
+        return [text]
+    try:
+        cells = json.loads(text).get("cells", [])
+    except ValueError:
+        return []
+    sources = []
+    for cell in cells:
+        if cell.get("cell_type") != "code":
+            continue
+        src = "".join(cell.get("source", []))
+        if src.lstrip().startswith("%%"):  # whole-cell magic, not Python
+            continue
+        sources.append("\n".join(line for line in src.splitlines()
+                                 if not line.lstrip().startswith(("%", "!"))))
+    return sources
+
+
+def _scan(path: Path) -> Tuple[Set[str], Set[str]]:
+    """Imported module names and string literals of ``path``."""
+    if path.suffix not in (".py", ".ipynb"):
+        text = path.read_text(encoding="utf-8", errors="replace")
+        return set(), set(_PATH_TOKEN.findall(text))
+    modules: Set[str] = set()
+    strings: Set[str] = set()
+    for source in _python_sources(path):
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.update(a.name for a in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules.add(node.module)
+            elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+                strings.add(node.value)
+    return modules, strings
+
+
+def _resolve_module(name: str, dirs: Iterable[Path]) -> Optional[Path]:
+    parts = name.split(".")
+    for d in dirs:
+        for n in range(len(parts), 0, -1):
+            base = d.joinpath(*parts[:n])
+            for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+                if candidate.is_file():
+                    return candidate
+    return None
+
+
+def _resolve_file(text: str, dirs: Iterable[Path],
+                  tracked: Optional[Set[Path]] = None) -> Optional[Path]:
+    if not text or len(text) > 200 or "\n" in text:
+        return None
+    for d in dirs:
+        try:
+            candidate = (d / text).resolve()
+        except (OSError, ValueError):
+            continue
+        if tracked is not None:
+            if candidate in tracked:
+                return candidate
+        elif candidate.is_file() and ROOT in candidate.parents:
+            return candidate
+    return None
+
+
+def dependencies(path: Path,
+                 tracked: Optional[Set[Path]] = None) -> Dict[str, str]:
+    """Files ``path`` depends on, mapped to how it depends on them.
+
+    String literals only count if they name one of the ``tracked`` files
+    (see :func:`tracked_files`; ``None``: any existing repository file).
+    """
+    deps = {item_key(path): "itself"}
+    todo = [path.resolve()]
+    while todo:
+        current = todo.pop()
+        dirs = [current.parent, ROOT]
+        modules, strings = _scan(current)
+        for name in modules:
+            mod = _resolve_module(name, dirs)
+            if mod is not None and item_key(mod) not in deps:
+                deps[item_key(mod)] = f"imports {item_key(mod)}"
+                todo.append(mod)
+        for text in strings:
+            ref = _resolve_file(text, dirs, tracked)
+            if ref is not None:
+                deps.setdefault(item_key(ref), f"references {item_key(ref)}")
+    return deps
+
+
+def affected(paths: Iterable[Path], changed: Set[str]
+             ) -> Tuple[List[Tuple[Path, str]], List[Tuple[Path, str]]]:
+    """Split ``paths`` into ``(selected, skipped)`` lists of (path, reason)."""
+    global_hits = sorted(f for f in changed
+                         if any(fnmatch.fnmatch(f, pat) for pat in GLOBAL_PATTERNS))
+    selected, skipped = [], []
+    tracked = None if global_hits else tracked_files()
+    for path in paths:
+        if global_hits:
+            selected.append((path, f"{global_hits[0]} changed"))
+            continue
+        deps = dependencies(path, tracked)
+        hits = sorted(f for f in deps if f in changed)
+        if not hits:
+            skipped.append((path, f"none of its {len(deps)} dependencies changed"))
+        elif item_key(path) in hits:
+            selected.append((path, "changed"))
+        else:
+            selected.append((path, f"{deps[hits[0]]} (changed)"))
+    return selected, skipped
+
+
+def print_selection(selected: List[Tuple[Path, str]],
+                    skipped: List[Tuple[Path, str]], ref: str) -> None:
+    print(f"Changed since {ref}: running {len(selected)}, "
+          f"skipping {len(skipped)}")
+    for path, why in selected:
+        print(f"  run   {path}  ({why})")
+    for path, why in skipped:
+        print(f"  skip  {path}  ({why})")
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Run history of the validators in a small SQLite database.
+
+With ``--history`` tools/validate_code.py and tools/validate_notebooks.py
+append every run to tools/_history.sqlite:
+
+    runs    one row per validator run: tool, time, git commit (+ dirty flag),
+            environment fingerprint hash (Python and tracked package versions)
+    items   per script/notebook: ok, cached, duration, CPU, peak RSS, I/O
+    cells   per notebook cell: duration
+
+The query commands below read only real runs (cached results are stored but
+ignored) and can work on cells instead of items (--cells).
+
+- ``trend`` lists the last N durations per item with a sparkline.
+- ``growth`` ranks items by the least-squares slope of their last N
+  durations (seconds per run and percent of the mean).
+- ``regressions`` compares each item's latest duration with its previous N.
+  A slowdown is flagged when it is at least --min-change slower than the
+  mean and --z standard deviations above it (the deviation is floored at 2%
+  of the mean so very stable items do not flag on noise).
+
+Usage
+  python tools/validate_code.py --history
+  python tools/history.py runs
+  python tools/history.py trend --last 10 08_numpy
+  python tools/history.py growth --top 5
+  python tools/history.py regressions --last 10 --z 3
+  python tools/history.py regressions --cells --same-env
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import socket
+import sqlite3
+import statistics
+import subprocess as sp
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from result_cache import environment_fingerprint
+from timings import ROOT
+
+
+HISTORY_DB = Path(__file__).resolve().parent / "_history.sqlite"
+SPARKS = "▁▂▃▄▅▆▇█"
+NOISE_FLOOR = 0.02  # minimum deviation, as a fraction of the mean
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tool TEXT NOT NULL,
+    started TEXT NOT NULL,
+    git_commit TEXT,
+    dirty INTEGER,
+    env_hash TEXT NOT NULL,
+    env TEXT NOT NULL,
+    host TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    item TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    cached INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    cpu REAL,
+    max_rss_kb INTEGER,
+    read_bytes INTEGER,
+    write_bytes INTEGER
+);
+CREATE TABLE IF NOT EXISTS cells (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    item TEXT NOT NULL,
+    cell INTEGER NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_by_item ON items (item, run_id);
+CREATE INDEX IF NOT EXISTS cells_by_item ON cells (item, cell, run_id);
+"""
+
+
+@dataclass
+class ItemRun:
+    item: str  # repository-relative key, see timings.item_key
+    kind: str  # py, sh or nb
+    ok: bool
+    duration: float
+    cached: bool = False
+    resources: Optional[object] = None  # proc_usage.Resources
+    cells: List[Tuple[int, float]] = field(default_factory=list)
+
+
+@dataclass
+class Sample:
+    run_id: int
+    duration: float
+    env_hash: str
+
+
+def connect(path: Path = HISTORY_DB) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)  # shards may write concurrently
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def git_state() -> Tuple[Optional[str], Optional[bool]]:
+    """HEAD commit and whether tracked files are modified (``None`` if no git)."""
+    try:
+        head = sp.run(["git", "-C", str(ROOT), "rev-parse", "HEAD"],
+                      capture_output=True, text=True)
+        status = sp.run(["git", "-C", str(ROOT), "status", "--porcelain",
+                         "--untracked-files=no"], capture_output=True, text=True)
+    except OSError:
+        return None, None
+    if head.returncode != 0:
+        return None, None
+    return head.stdout.strip(), bool(status.stdout.strip())
+
+
+def record_run(tool: str, runs: Iterable[ItemRun],
+               path: Path = HISTORY_DB) -> int:
+    """Append one validator run to the database; return its run id."""
+    env = json.dumps(environment_fingerprint(), sort_keys=True)
+    env_hash = hashlib.sha256(env.encode()).hexdigest()[:12]
+    commit, dirty = git_state()
+    started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with closing(connect(path)) as conn, conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (tool, started, git_commit, dirty, env_hash, env, host)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (tool, started, commit, dirty, env_hash, env, socket.gethostname()),
+        ).lastrowid
+        for r in runs:
+            res = r.resources
+            conn.execute(
+                "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, r.item, r.kind, r.ok, r.cached, r.duration,
+                 res.cpu if res else None, res.max_rss_kb if res else None,
+                 res.read_bytes if res else None, res.write_bytes if res else None))
+            conn.executemany("INSERT INTO cells VALUES (?, ?, ?, ?)",
+                             [(run_id, r.item, i, d) for i, d in r.cells])
+    return run_id
+
+
+def series(conn: sqlite3.Connection, cells: bool = False,
+           match: str = "") -> Dict[str, List[Sample]]:
+    """Durations of passing, non-cached runs per item (or cell), oldest first."""
+    if cells:
+        sql = ("SELECT c.item || ' [' || c.cell || ']', c.run_id, c.duration,"
+               " r.env_hash FROM cells c JOIN runs r ON r.id = c.run_id"
+               " WHERE c.item LIKE ? AND EXISTS (SELECT 1 FROM items i"
+               "  WHERE i.run_id = c.run_id AND i.item = c.item"
+               "  AND i.ok AND NOT i.cached)"
+               " ORDER BY c.item, c.cell, c.run_id")
+    else:
+        sql = ("SELECT i.item, i.run_id, i.duration, r.env_hash FROM items i"
+               " JOIN runs r ON r.id = i.run_id"
+               " WHERE i.ok AND NOT i.cached AND i.item LIKE ?"
+               " ORDER BY i.item, i.run_id")
+    out: Dict[str, List[Sample]] = {}
+    for key, run_id, dur, env_hash in conn.execute(sql, (f"%{match}%",)):
+        out.setdefault(key, []).append(Sample(run_id, dur, env_hash))
+    return out
+
+
+def sparkline(values: List[float]) -> str:
+    lo, hi = min(values), max(values)
+    span = (hi - lo) or 1.0
+    return "".join(SPARKS[int((v - lo) / span * (len(SPARKS) - 1))] for v in values)
+
+
+def slope(values: List[float]) -> float:
+    """Least-squares slope of ``values`` against their index."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mx = (n - 1) / 2
+    my = sum(values) / n
+    num = sum((x - mx) * (y - my) for x, y in enumerate(values))
+    return num / sum((x - mx) ** 2 for x in range(n))
+
+
+def regressions(data: Dict[str, List[Sample]], last: int, z: float,
+                min_change: float, same_env: bool = False
+                ) -> List[Tuple[str, float, float, float, float]]:
+    """``(key, latest, mean, change, zscore)`` of significant slowdowns.
+
+    The latest sample of each key is compared with up to ``last`` earlier
+    ones (with ``same_env``, only those of the same environment); at least
+    three are needed.
+    """
+    flagged = []
+    for key, samples in data.items():
+        latest = samples[-1]
+        base = [s.duration for s in samples[:-1]
+                if not same_env or s.env_hash == latest.env_hash][-last:]
+        if len(base) < 3:
+            continue
+        mean = statistics.fmean(base)
+        sd = max(statistics.stdev(base), NOISE_FLOOR * mean, 1e-6)
+        score = (latest.duration - mean) / sd
+        change = latest.duration / mean - 1 if mean else 0.0
+        if score >= z and change >= min_change:
+            flagged.append((key, latest.duration, mean, change, score))
+    return sorted(flagged, key=lambda f: -f[4])
+
+
+def _print_runs(conn: sqlite3.Connection, last: int) -> None:
+    rows = conn.execute(
+        "SELECT r.id, r.tool, r.started, r.git_commit, r.dirty, r.env_hash,"
+        " COUNT(i.item), SUM(i.ok), SUM(i.cached), SUM(i.duration)"
+        " FROM runs r LEFT JOIN items i ON i.run_id = r.id"
+        " GROUP BY r.id ORDER BY r.id DESC LIMIT ?", (last,)).fetchall()
+    for rid, tool, started, commit, dirty, env_hash, n, ok, cached, total in reversed(rows):
+        rev = (commit or "-")[:10] + ("+" if dirty else "")
+        print(f"#{rid:<5} {started}  {tool:18} {rev:11}  env {env_hash}  "
+              f"{ok or 0}/{n} ok, {cached or 0} cached, {total or 0.0:.2f}s")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--db", type=Path, default=HISTORY_DB,
+                   help="history database (default: tools/_history.sqlite)")
+    sub = p.add_subparsers(dest="command", required=True)
+    runs = sub.add_parser("runs", help="list recorded runs")
+    runs.add_argument("--last", type=int, default=20, help="runs to list (default: 20)")
+    for name, text in (("trend", "recent durations per item"),
+                       ("growth", "items whose duration grows fastest"),
+                       ("regressions", "significant slowdowns of the latest run")):
+        q = sub.add_parser(name, help=text)
+        q.add_argument("match", nargs="?", default="",
+                       help="only items whose key contains this text")
+        q.add_argument("--cells", action="store_true",
+                       help="notebook cells instead of scripts/notebooks")
+        q.add_argument("--last", type=int, default=10,
+                       help="runs to consider per item (default: 10)")
+        q.add_argument("--top", type=int, default=20,
+                       help="rows to print (default: 20)")
+        if name == "regressions":
+            q.add_argument("--z", type=float, default=3.0,
+                           help="standard deviations above the mean (default: 3)")
+            q.add_argument("--min-change", type=float, default=0.10,
+                           help="minimum relative slowdown (default: 0.10)")
+            q.add_argument("--same-env", action="store_true",
+                           help="compare only with runs in the same environment")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    if not args.db.is_file():
+        print(f"No history at {args.db}; run a validator with --history first")
+        return 1
+    with closing(connect(args.db)) as conn:
+        if args.command == "runs":
+            _print_runs(conn, args.last)
+            return 0
+        data = series(conn, args.cells, args.match)
+
+    if args.command == "trend":
+        for key in list(data)[:args.top]:
+            values = [s.duration for s in data[key][-args.last:]]
+            print(f"  {key:58} {sparkline(values)}  last {values[-1]:7.3f}s  "
+                  f"mean {statistics.fmean(values):7.3f}s  n={len(values)}")
+    elif args.command == "growth":
+        rows = []
+        for key, samples in data.items():
+            values = [s.duration for s in samples[-args.last:]]
+            mean = statistics.fmean(values) if len(values) >= 3 else 0.0
+            if mean > 0:  # all-zero durations (cached, instant) cannot grow
+                b = slope(values)
+                rows.append((b / mean, b, key, values))
+        rows.sort(key=lambda r: -r[0])
+        for rel, b, key, values in rows[:args.top]:
+            print(f"  {key:58} {b * 1e3:+8.1f} ms/run  {rel:+6.1%}/run  "
+                  f"{sparkline(values)}")
+    else:
+        flagged = regressions(data, args.last, args.z, args.min_change,
+                              args.same_env)
+        if not flagged:
+            print(f"No significant slowdowns in the latest runs "
+                  f"(z >= {args.z}, change >= {args.min_change:.0%})")
+            return 0
+        print(f"Significant slowdowns ({len(flagged)}):")
+        for key, latest, mean, change, score in flagged[:args.top]:
+            print(f"  {key:58} {latest:7.2f}s vs mean {mean:7.2f}s  "
+                  f"{change:+6.1%}  z={score:.1f}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
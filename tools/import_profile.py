@@ -0,0 +1,90 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Parse ``python -X importtime`` output into a per-module tree.
+
+CPython prints one stderr line per imported module *after* the module (and
+everything it imports) has finished loading, e.g.
+
+    import time: self [us] | cumulative | imported package
+    import time:       289 |        289 |       _json
+    import time:       537 |        826 |     json.scanner
+    import time:       293 |       2208 | json
+
+Indentation encodes nesting, so a line adopts all preceding, not yet
+claimed lines that are one level deeper as its children.
+
+Used by tools/validate_code.py --import-profile.
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+PREFIX = "import time:"
+
+
+@dataclass
+class ImportNode:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    children: List["ImportNode"] = field(default_factory=list)
+
+    def to_dict(self, max_depth: int = 1) -> Dict[str, object]:
+        d: Dict[str, object] = {
+            "module": self.module,
+            "self": self.self_us / 1e6,
+            "cumulative": self.cumulative_us / 1e6,
+        }
+        if max_depth > 0 and self.children:
+            kids = sorted(self.children, key=lambda n: -n.cumulative_us)
+            d["children"] = [k.to_dict(max_depth - 1) for k in kids[:5]]
+        return d
+
+
+class ImportTimeParser:
+    """Line sink that builds the import tree; usable as ``on_line`` hook."""
+
+    def __init__(self) -> None:
+        self.roots: List[ImportNode] = []
+        self._pending: List[ImportNode] = []
+
+    def feed(self, line: str) -> bool:
+        """Consume ``line`` if it is importtime output; return whether it was."""
+        if not line.startswith(PREFIX):
+            return False
+        try:
+            self_us, cum_us, name = line[len(PREFIX):].split("|", 2)
+            self_us, cum_us = int(self_us), int(cum_us)
+        except ValueError:  # the header line
+            return True
+        name = name.rstrip("\n")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        node = ImportNode(name.strip(), self_us, cum_us, depth)
+        while self._pending and self._pending[-1].depth > depth:
+            node.children.insert(0, self._pending.pop())
+        self._pending.append(node)
+        if depth == 0:
+            self.roots.append(node)
+        return True
+
+    @property
+    def total(self) -> float:
+        """Seconds spent importing (sum over top-level imports)."""
+        return sum(n.cumulative_us for n in self.roots) / 1e6
+
+    def top(self, n: int = 5) -> List[ImportNode]:
+        """Top-level imports with the largest cumulative time."""
+        return sorted(self.roots, key=lambda r: -r.cumulative_us)[:n]
+
+    def summary(self, n: int = 5) -> Dict[str, object]:
+        return {"total": self.total,
+                "top": [node.to_dict() for node in self.top(n)]}
@@ -0,0 +1,221 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Warm Jupyter kernels recycled across notebooks.
+
+Starting a kernel takes a second or more before the first cell runs. A
+pooled kernel is instead handed from notebook to notebook; before each reuse
+its user namespace is cleared (``%reset -f``), the working directory
+restored and open matplotlib figures closed (rc settings back to defaults).
+
+Imported modules survive a reset, which is the point, but also a risk. The
+kernel is therefore restarted rather than reset when
+- the previous notebook failed or timed out, or
+- it leaked state a reset cannot undo: ``sys.path`` or ``os.environ``
+  changed, or a module from the working tree (e.g. a helper file the
+  notebook wrote) was imported.
+
+Used by tools/validate_notebooks.py --reuse-kernels.
+
+Requirements
+  pip install nbclient (brings jupyter_client)
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from jupyter_client.manager import AsyncKernelManager  # type: ignore
+
+
+STARTUP_TIMEOUT = 60
+RESET_TIMEOUT = 30
+
+# Evaluated as a user expression, so it binds no names in the kernel.
+_STATE_EXPR = """__import__('json').dumps({
+    'path': __import__('sys').path,
+    'environ': sorted(__import__('os').environ.items()),
+    'local': sorted(name for name, f in (
+        (name, str(getattr(m, '__file__', None) or ''))
+        for name, m in list(__import__('sys').modules.items()))
+        if f.startswith(%(root)r) and not f.startswith(__import__('sys').prefix)),
+})"""
+
+_RESET_CODE = """%%reset -f
+__import__('os').chdir(%(root)r)
+if 'matplotlib.pyplot' in __import__('sys').modules:
+    __import__('sys').modules['matplotlib.pyplot'].close('all')
+    __import__('matplotlib').rc_file_defaults()
+"""
+
+
+@dataclass
+class PoolStats:
+    starts: int = 0  # kernel launches, restarts included
+    start_time: float = 0.0
+    reused: int = 0  # notebooks that ran on an already warm kernel
+    overhead: float = 0.0  # state checks and resets
+    restarts: Counter = field(default_factory=Counter)  # reason -> count
+
+    @property
+    def mean_start(self) -> float:
+        return self.start_time / self.starts if self.starts else 0.0
+
+    @property
+    def saved(self) -> float:
+        """Estimated seconds saved: avoided kernel starts minus reset cost."""
+        return self.reused * self.mean_start - self.overhead
+
+    def describe(self) -> str:
+        text = (f"{self.starts} kernel start(s) ({self.mean_start:.2f}s each), "
+                f"{self.reused} notebook(s) on a warm kernel; "
+                f"est. startup saved {self.saved:.2f}s "
+                f"(after {self.overhead:.2f}s of resets)")
+        if self.restarts:
+            reasons = ", ".join(f"{r}: {n}" for r, n in self.restarts.items())
+            text += f"; restarts: {reasons}"
+        return text
+
+
+class WarmKernel:
+    """A running kernel with its client and post-start state."""
+
+    def __init__(self, km: AsyncKernelManager, kc) -> None:
+        self.km = km
+        self.kc = kc
+        self.baseline: Dict[str, object] = {}
+        self.uses = 0
+        self.dirty: Optional[str] = None  # restart reason from the last use
+
+    @property
+    def reused(self) -> bool:
+        return self.uses > 1
+
+
+class KernelPool:
+    """Hands out warm kernels; at most one notebook per kernel at a time.
+
+    The pool grows on demand, so the caller's concurrency limit (``--jobs``)
+    also bounds the number of kernels. Kernels are bound to the event loop
+    they were started in.
+    """
+
+    def __init__(self, kernel_name: str = "python3",
+                 root: Optional[str] = None) -> None:
+        self.kernel_name = kernel_name
+        self.root = os.path.abspath(root or os.getcwd())
+        self.stats = PoolStats()
+        self._idle: List[WarmKernel] = []
+        self._all: List[WarmKernel] = []
+
+    async def acquire(self) -> WarmKernel:
+        """An idle kernel, reset or restarted as needed, or a new one."""
+        if self._idle:
+            kernel = self._idle.pop()
+            await self._recycle(kernel)
+        else:
+            kernel = await self._start()
+        kernel.uses += 1
+        return kernel
+
+    def release(self, kernel: WarmKernel, ok: bool) -> None:
+        """Return ``kernel``; a failed run has it restarted on next use."""
+        kernel.dirty = None if ok else "failed"
+        self._idle.append(kernel)
+
+    async def close(self) -> None:
+        for kernel in self._all:
+            try:
+                kernel.kc.stop_channels()
+                await kernel.km.shutdown_kernel(now=True)
+            except Exception:
+                pass
+        self._all.clear()
+        self._idle.clear()
+
+    async def _start(self) -> WarmKernel:
+        t0 = time.perf_counter()
+        km = AsyncKernelManager(kernel_name=self.kernel_name)
+        # same history setting nbclient uses for the kernels it starts
+        await km.start_kernel(cwd=self.root,
+                              extra_arguments=["--HistoryManager.hist_file=:memory:"])
+        kc = km.client()
+        kc.start_channels()
+        await kc.wait_for_ready(timeout=STARTUP_TIMEOUT)
+        kc.allow_stdin = False
+        self._count_start(t0)
+        kernel = WarmKernel(km, kc)
+        self._all.append(kernel)
+        kernel.baseline = await self._state(kernel)
+        return kernel
+
+    async def _restart(self, kernel: WarmKernel, reason: str) -> None:
+        self.stats.restarts[reason] += 1
+        t0 = time.perf_counter()
+        await kernel.km.restart_kernel(now=True)
+        await kernel.kc.wait_for_ready(timeout=STARTUP_TIMEOUT)
+        self._count_start(t0)
+        kernel.uses = 0
+        kernel.dirty = None
+        kernel.baseline = await self._state(kernel)
+
+    async def _recycle(self, kernel: WarmKernel) -> None:
+        reason = kernel.dirty or await self._leak(kernel)
+        if reason is None:
+            t0 = time.perf_counter()
+            try:
+                await self._execute(kernel, _RESET_CODE % {"root": self.root})
+            except Exception:
+                reason = "reset failed"
+            self.stats.overhead += time.perf_counter() - t0
+        if reason is not None:
+            await self._restart(kernel, reason)
+        else:
+            self.stats.reused += 1
+
+    async def _leak(self, kernel: WarmKernel) -> Optional[str]:
+        """Why ``kernel`` cannot simply be reset (``None`` if it can)."""
+        t0 = time.perf_counter()
+        try:
+            state = await self._state(kernel)
+        except Exception:
+            return "unresponsive"
+        finally:
+            self.stats.overhead += time.perf_counter() - t0
+        base = kernel.baseline
+        if state["path"] != base["path"]:
+            return "sys.path changed"
+        if state["environ"] != base["environ"]:
+            return "os.environ changed"
+        if set(state["local"]) - set(base["local"]):
+            return "local module imported"
+        return None
+
+    async def _state(self, kernel: WarmKernel) -> Dict[str, object]:
+        reply = await self._execute(kernel, "",
+                                    {"state": _STATE_EXPR % {"root": self.root}})
+        value = reply["content"]["user_expressions"]["state"]
+        if value.get("status") != "ok":
+            raise RuntimeError(f"state query failed: {value.get('evalue')}")
+        return json.loads(ast.literal_eval(value["data"]["text/plain"]))
+
+    async def _execute(self, kernel: WarmKernel, code: str,
+                       user_expressions: Optional[Dict[str, str]] = None) -> dict:
+        reply = await kernel.kc.execute_interactive(
+            code, silent=False, store_history=False,
+            user_expressions=user_expressions or {}, timeout=RESET_TIMEOUT,
+            output_hook=lambda msg: None)
+        if reply["content"]["status"] != "ok":
+            raise RuntimeError(reply["content"].get("evalue", "execution failed"))
+        return reply
+
+    def _count_start(self, t0: float) -> None:
+        self.stats.starts += 1
+        self.stats.start_time += time.perf_counter() - t0
@@ -0,0 +1,232 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Kernel-less notebook execution: run code cells in a plain interpreter.
+
+Most early chapters are plain Python, so the Jupyter kernel and its ZMQ
+protocol are pure overhead for them. This file is run as a driver in a
+fresh subprocess,
+
+    python tools/nb_inproc.py RESULT.json [TIMEOUT] < cells.json
+
+where ``cells.json`` is a list of ``{"index": i, "source": "..."}`` code
+cells. They run in order in one shared ``__main__`` namespace; stdout and
+stderr are captured per cell and the value of a trailing expression is
+kept like Jupyter's ``execute_result``, formatted like IPython does it: its
+``repr`` as ``text/plain`` plus whatever its ``_repr_mimebundle_`` /
+``_repr_html_`` / ``_repr_png_`` ... methods return (so a DataFrame keeps
+its ``text/html``). Execution stops at the first
+exception. Like nbclient's ``timeout``, TIMEOUT (seconds) limits each
+cell, not the notebook: a cell still running after it fails with
+``CellTimeoutError`` (POSIX only, via SIGALRM). RESULT.json receives
+per-cell outputs (nbformat output dicts) and timestamps plus, on failure,
+the failing cell index, exception name, value and traceback.
+
+Notebooks using IPython syntax (magics, shell escapes, ``?`` help) or rich
+display are left to the kernel; see :func:`kernel_required`.
+
+Used by tools/validate_notebooks.py --engine inproc.
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+import ast
+import base64
+import contextlib
+import io
+import json
+import linecache
+import os
+import re
+import signal
+import sys
+import traceback
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Names that only make sense with IPython's display machinery.
+RICH_DISPLAY = re.compile(r"\b(get_ipython|display|IPython)\b")
+
+# IPython's ``_repr_*_`` display protocol: mime type -> method name.
+REPR_METHODS = {
+    "text/html": "_repr_html_",
+    "text/markdown": "_repr_markdown_",
+    "text/latex": "_repr_latex_",
+    "image/svg+xml": "_repr_svg_",
+    "image/png": "_repr_png_",
+    "image/jpeg": "_repr_jpeg_",
+    "application/json": "_repr_json_",
+    "application/javascript": "_repr_javascript_",
+    "application/pdf": "_repr_pdf_",
+}
+
+
+def kernel_required(nb) -> Optional[str]:
+    """Why ``nb`` needs a Jupyter kernel (``None`` if plain Python will do)."""
+    for idx, cell in enumerate(nb.cells):
+        if cell.get("cell_type") != "code":
+            continue
+        source = str(cell.get("source", ""))
+        try:
+            ast.parse(source)
+        except SyntaxError:
+            if re.search(r"^\s*[%!]", source, re.M):
+                return f"magic or shell escape in cell {idx}"
+            return f"IPython-only syntax in cell {idx}"
+        if RICH_DISPLAY.search(source):
+            return f"rich display in cell {idx}"
+    return None
+
+
+class CellTimeoutError(BaseException):
+    """A cell ran longer than the timeout (a BaseException, like
+    KeyboardInterrupt, so ``except Exception`` in a cell cannot swallow it)."""
+
+
+def inproc_command(result_path: Path,
+                   timeout: Optional[float] = None) -> List[str]:
+    """Interpreter arguments that run the driver writing to ``result_path``."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), str(result_path)]
+    return cmd if timeout is None else cmd + [str(timeout)]
+
+
+@contextlib.contextmanager
+def _cell_timeout(seconds: Optional[float]):
+    """Raise :class:`CellTimeoutError` in the cell after ``seconds``."""
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise CellTimeoutError(f"Cell execution timed out after {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _now() -> str:
+    # same format as the timestamps nbclient records
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _stream(name: str, text: str) -> Dict[str, object]:
+    return {"output_type": "stream", "name": name, "text": text}
+
+
+def mimebundle(obj: object) -> Dict[str, object]:
+    """``obj`` as IPython's display formatter would show it.
+
+    ``_repr_mimebundle_`` and the ``_repr_*_`` methods are asked in turn;
+    ``None`` results and methods that raise are skipped, as in IPython.
+    Binary payloads (PNG, JPEG, PDF) are base64-encoded like in nbformat.
+    """
+    data: Dict[str, object] = {}
+    if not isinstance(obj, type):  # classes only have unbound methods
+        hooks = [("_repr_mimebundle_", None)]
+        hooks += [(name, mime) for mime, name in REPR_METHODS.items()]
+        for name, mime in hooks:
+            method = getattr(obj, name, None)
+            if not callable(method) or mime in data:
+                continue
+            try:
+                value = method()
+            except Exception:  # noqa: BLE001 - IPython skips broken reprs too
+                continue
+            if isinstance(value, tuple):  # (data, metadata)
+                value = value[0]
+            if value is None:
+                continue
+            for key, item in (value.items() if mime is None else [(mime, value)]):
+                if isinstance(item, bytes):
+                    item = base64.b64encode(item).decode("ascii")
+                data.setdefault(key, item)
+    data.setdefault("text/plain", repr(obj))
+    return data
+
+
+def _run_cell(index: int, source: str, ns: dict,
+              timeout: Optional[float] = None) -> Dict[str, object]:
+    """Execute one cell in ``ns``; return its record (with ``error`` on failure)."""
+    filename = f"<cell {index}>"
+    linecache.cache[filename] = (len(source), None,
+                                 source.splitlines(True), filename)
+    record: Dict[str, object] = {"index": index, "start": _now()}
+    out, err = io.StringIO(), io.StringIO()
+    result = None
+    try:
+        tree = ast.parse(source, filename)
+        last = None
+        if tree.body and isinstance(tree.body[-1], ast.Expr):
+            last = ast.Expression(tree.body.pop().value)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err), \
+                _cell_timeout(timeout):
+            exec(compile(tree, filename, "exec"), ns)
+            if last is not None:
+                result = eval(compile(last, filename, "eval"), ns)
+    except BaseException as exc:  # noqa: BLE001 - reported per cell
+        if isinstance(exc, SyntaxError):
+            tb = traceback.format_exception_only(type(exc), exc)
+        else:
+            tb = traceback.format_exception(type(exc), exc,
+                                            exc.__traceback__.tb_next)
+        record["error"] = {"ename": type(exc).__name__, "evalue": str(exc),
+                           "traceback": [line.rstrip("\n") for line in tb
+                                         if not line.startswith("Traceback ")]}
+    record["end"] = _now()
+    outputs = []
+    if out.getvalue():
+        outputs.append(_stream("stdout", out.getvalue()))
+    if err.getvalue():
+        outputs.append(_stream("stderr", err.getvalue()))
+    if result is not None:
+        outputs.append({"output_type": "execute_result", "metadata": {},
+                        "data": mimebundle(result)})
+    if "error" in record:
+        outputs.append({"output_type": "error", **record["error"]})  # type: ignore[dict-item]
+    record["outputs"] = outputs
+    return record
+
+
+def run_cells(cells: List[Dict[str, object]],
+              timeout: Optional[float] = None) -> Dict[str, object]:
+    """Run ``cells`` in one namespace, stopping at the first error; each
+    cell may run for at most ``timeout`` seconds."""
+    ns: dict = {"__name__": "__main__", "__builtins__": __builtins__}
+    records = []
+    error = None
+    for cell in cells:
+        record = _run_cell(int(cell["index"]), str(cell["source"]), ns, timeout)
+        records.append(record)
+        if "error" in record:
+            error = {"index": record["index"], **record["error"]}  # type: ignore[dict-item]
+            break
+    return {"cells": records, "error": error}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) not in (1, 2):
+        print(__doc__, file=sys.stderr)
+        return 2
+    timeout = float(args[1]) if len(args) == 2 else None
+    # like a kernel: cwd first on sys.path, headless plotting
+    sys.path[0] = ""
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    cells = json.load(sys.stdin)
+    result = run_cells(cells, timeout)
+    Path(args[0]).write_text(json.dumps(result), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Content-addressed, compressed store for executed notebooks.
+
+Layout under the store root (tools/_executed/ by default):
+
+    blobs/ab/cdef....gz   gzip-compressed blobs named by their SHA-256
+    <name>.ref            hash of the notebook skeleton for notebook <name>
+    <name>.run            run-specific data of the last run (JSON): per-cell
+                          execution timestamps and the caller's ``run`` dict
+
+Large output payloads (base64 PNGs, HTML tables, long stream text) are
+moved out of the notebook into their own blobs and replaced by
+``{"$blob": "<sha256>"}`` references. The remaining skeleton is stored as a
+blob as well. Cell execution timestamps, which differ on every run, are
+kept out of the skeleton in the small .run file. Identical outputs across
+runs or notebooks are thus stored once, and a run with unchanged outputs
+writes nothing but the .run file.
+
+Unreferenced blobs are only deleted by an explicit ``--prune``: a
+validation run in progress may have written blobs it does not reference
+yet, so do not prune while one is running.
+
+Usage
+  python tools/nb_store.py --list
+  python tools/nb_store.py --export 08_NumPy_Essentials --out /tmp/08.ipynb
+  python tools/nb_store.py --prune        # drop unreferenced blobs (not
+                                          # while a validation run is active)
+
+Used by tools/validate_notebooks.py.
+
+Requirements
+  pip install nbformat
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+import nbformat  # type: ignore
+
+
+STORE_DIR = Path(__file__).resolve().parent / "_executed"
+BLOB_MIN = 1024  # payloads at least this many characters become blobs
+REF_KEY = "$blob"
+
+
+def _is_ref(value: object) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and REF_KEY in value
+
+
+def _text(value: object) -> str:
+    # nbformat allows multiline strings as lists of lines
+    return "".join(value) if isinstance(value, list) else str(value)
+
+
+class NotebookStore:
+    def __init__(self, root: Path = STORE_DIR) -> None:
+        self.root = root
+
+    # -- blobs -------------------------------------------------------------
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / f"{digest[2:]}.gz"
+
+    def put_blob(self, data: bytes) -> str:
+        """Store ``data`` unless present; return its SHA-256."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if not path.is_file():
+            _atomic_write(path, gzip.compress(data, mtime=0))
+        return digest
+
+    def get_blob(self, digest: str) -> bytes:
+        return gzip.decompress(self._blob_path(digest).read_bytes())
+
+    # -- notebooks ---------------------------------------------------------
+    def put(self, name: str, nb, run: Optional[dict] = None) -> str:
+        """Store executed notebook ``nb`` as ``name``; return its skeleton hash.
+
+        Cell ``metadata.execution`` timestamps and the JSON-serializable
+        ``run`` dict (e.g. the run's duration) go to the .run file, so the
+        skeleton, and with it the ref file, only changes with the outputs.
+        """
+        skeleton = json.loads(json.dumps(nb))
+        execution = {}
+        for i, cell in enumerate(skeleton.get("cells", [])):
+            stamps = cell.get("metadata", {}).pop("execution", None)
+            if stamps is not None:
+                execution[str(i)] = stamps
+            for out in cell.get("outputs", []) or []:
+                self._externalize(out)
+        digest = self.put_blob(json.dumps(skeleton, sort_keys=True,
+                                          separators=(",", ":")).encode())
+        ref = self.root / f"{name}.ref"
+        if self._read_ref(ref) != digest:
+            _atomic_write(ref, digest.encode())
+        _atomic_write(self.root / f"{name}.run",
+                      json.dumps({"execution": execution,
+                                  "run": run or {}}).encode())
+        return digest
+
+    def get(self, name: str):
+        """The stored notebook ``name`` (``None`` if absent or unreadable)."""
+        digest = self._read_ref(self.root / f"{name}.ref")
+        if digest is None:
+            return None
+        try:
+            skeleton = json.loads(self.get_blob(digest))
+            for cell in skeleton.get("cells", []):
+                for out in cell.get("outputs", []) or []:
+                    self._inline(out)
+        except (OSError, ValueError):
+            return None
+        execution = self._read_run(name).get("execution", {})
+        for i, cell in enumerate(skeleton.get("cells", [])):
+            if str(i) in execution:
+                cell.setdefault("metadata", {})["execution"] = execution[str(i)]
+        return nbformat.from_dict(skeleton)
+
+    def run_info(self, name: str) -> dict:
+        """The ``run`` dict stored with the last :meth:`put` of ``name``."""
+        return self._read_run(name).get("run", {})
+
+    def names(self) -> List[str]:
+        return sorted(p.stem for p in self.root.glob("*.ref"))
+
+    def prune(self) -> int:
+        """Delete blobs no ref points to; return how many were removed."""
+        live = set(self._live_blobs())
+        removed = 0
+        for path in self.root.glob("blobs/*/*.gz"):
+            if path.parent.name + path.name[:-3] not in live:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def _externalize(self, out: dict) -> None:
+        data = out.get("data")
+        if isinstance(data, dict):
+            for mime, value in data.items():
+                if isinstance(value, (str, list)) and len(_text(value)) >= BLOB_MIN:
+                    data[mime] = {REF_KEY: self.put_blob(_text(value).encode())}
+        text = out.get("text")
+        if text is not None and len(_text(text)) >= BLOB_MIN:
+            out["text"] = {REF_KEY: self.put_blob(_text(text).encode())}
+
+    def _inline(self, out: dict) -> None:
+        data = out.get("data")
+        if isinstance(data, dict):
+            for mime, value in data.items():
+                if _is_ref(value):
+                    data[mime] = self.get_blob(value[REF_KEY]).decode()
+        if _is_ref(out.get("text")):
+            out["text"] = self.get_blob(out["text"][REF_KEY]).decode()
+
+    def _live_blobs(self) -> Iterator[str]:
+        for name in self.names():
+            digest = self._read_ref(self.root / f"{name}.ref")
+            if digest is None:
+                continue
+            yield digest
+            try:
+                skeleton = json.loads(self.get_blob(digest))
+            except (OSError, ValueError):
+                continue
+            for cell in skeleton.get("cells", []):
+                for out in cell.get("outputs", []) or []:
+                    values = list((out.get("data") or {}).values())
+                    values.append(out.get("text"))
+                    yield from (v[REF_KEY] for v in values if _is_ref(v))
+
+    def _read_run(self, name: str) -> dict:
+        try:
+            data = json.loads((self.root / f"{name}.run").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _read_ref(path: Path) -> Optional[str]:
+        try:
+            return path.read_text(encoding="ascii").strip() or None
+        except OSError:
+            return None
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--root", type=Path, default=STORE_DIR,
+                   help="store directory (default: tools/_executed)")
+    p.add_argument("--list", action="store_true", help="list stored notebooks")
+    p.add_argument("--export", metavar="NAME",
+                   help="write the stored notebook NAME as .ipynb")
+    p.add_argument("--out", type=Path,
+                   help="output path for --export (default: NAME.executed.ipynb)")
+    p.add_argument("--prune", action="store_true",
+                   help="delete blobs not referenced by any stored notebook "
+                        "(do not run while a validation is in progress)")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    store = NotebookStore(args.root)
+    if args.list:
+        for name in store.names():
+            print(name)
+    if args.export:
+        nb = store.get(args.export)
+        if nb is None:
+            print(f"No stored notebook named {args.export!r}", file=sys.stderr)
+            return 1
+        out = args.out or Path(f"{args.export}.executed.ipynb")
+        nbformat.write(nb, out)
+        print(f"Wrote {out}")
+    if args.prune:
+        print(f"Removed {store.prune()} unreferenced blob(s)")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
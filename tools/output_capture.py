@@ -0,0 +1,164 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Streaming, bounded-memory capture of child process output.
+
+Child pipes are read line by line while the process runs. Each line can be
+- kept in a head buffer (first ``head`` characters) and a tail ring buffer
+  (last ``tail`` characters), so memory stays bounded however much a script
+  prints,
+- echoed live to the console with a ``[name]`` prefix, and
+- appended to a full log file on disk.
+
+Used by tools/validate_code.py and code/run_all.py.
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+import subprocess as sp
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, Deque, List, Optional, Sequence
+
+from proc_usage import Resources, wait_process
+
+
+HEAD_CHARS = 10_000
+TAIL_CHARS = 5_000
+MAX_LINE = 8_192  # longest chunk read at once; longer lines arrive in pieces
+
+# Shared by everything that prints on behalf of a running script, so live
+# lines and per-script blocks never interleave mid-line.
+console_lock = threading.Lock()
+
+
+class OutputCapture:
+    """Keep the first ``head`` and last ``tail`` characters of a stream."""
+
+    def __init__(self, head: int = HEAD_CHARS, tail: int = TAIL_CHARS,
+                 prefix: Optional[str] = None, log: Optional[IO[str]] = None,
+                 on_line: Optional[Callable[[str], bool]] = None) -> None:
+        self.head_limit = head
+        self.tail_limit = tail
+        self.prefix = prefix
+        self.log = log
+        self.on_line = on_line
+        self.total = 0
+        self._head: List[str] = []
+        self._head_len = 0
+        self._tail: Deque[str] = deque()
+        self._tail_len = 0
+
+    def feed(self, line: str) -> None:
+        # ``on_line`` sees every line first; a truthy return consumes it
+        # (e.g. -X importtime records parsed separately).
+        if self.on_line is not None and self.on_line(line):
+            return
+        self.total += len(line)
+        if self._head_len < self.head_limit:
+            part = line[: self.head_limit - self._head_len]
+            self._head.append(part)
+            self._head_len += len(part)
+        self._tail.append(line)
+        self._tail_len += len(line)
+        while self._tail_len - len(self._tail[0]) >= self.tail_limit:
+            self._tail_len -= len(self._tail.popleft())
+        if self.prefix is not None:
+            with console_lock:
+                print(f"[{self.prefix}] {line.rstrip()}", flush=True)
+        if self.log is not None:
+            self.log.write(line)
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > self.head_limit
+
+    @property
+    def head(self) -> str:
+        return "".join(self._head)
+
+    @property
+    def tail(self) -> str:
+        return "".join(self._tail)[-self.tail_limit:] if self.tail_limit else ""
+
+    def text(self) -> str:
+        """Head, an omission marker, and the tail (without overlap)."""
+        head = self.head
+        if not self.truncated:
+            return head
+        tail = self.tail[-(self.total - self.head_limit):]
+        omitted = self.total - len(head) - len(tail)
+        if omitted <= 0:
+            return head + tail
+        return f"{head}\n... [{omitted} characters omitted] ...\n{tail}"
+
+
+def pump(stream: IO, capture: OutputCapture) -> None:
+    """Feed ``stream`` into ``capture`` line by line until EOF."""
+    with stream:
+        while True:
+            line = stream.readline(MAX_LINE)
+            if not line:
+                break
+            if isinstance(line, bytes):
+                line = line.decode(errors="replace")
+            capture.feed(line)
+
+
+@dataclass
+class ProcessOutput:
+    returncode: int
+    duration: float
+    stdout: OutputCapture
+    stderr: Optional[OutputCapture] = None
+    resources: Optional[Resources] = None
+
+
+def run_process(cmd: Sequence[str], env: dict, timeout: float,
+                stdout: OutputCapture,
+                stderr: Optional[OutputCapture] = None) -> ProcessOutput:
+    """Run ``cmd`` while streaming its output into the given captures.
+
+    Without a ``stderr`` capture, stderr is merged into stdout. The child's
+    CPU time, peak memory, page faults and I/O are collected when it is
+    reaped (see tools/proc_usage.py). On timeout the child is killed and
+    :class:`subprocess.TimeoutExpired` raised with the output captured so far.
+    """
+    t0 = time.perf_counter()
+    proc = sp.Popen(list(cmd), env=env, stdout=sp.PIPE,
+                    stderr=sp.PIPE if stderr is not None else sp.STDOUT,
+                    text=True, errors="replace")
+    readers = [threading.Thread(target=pump, args=(proc.stdout, stdout),
+                                daemon=True)]
+    if stderr is not None:
+        readers.append(threading.Thread(target=pump, args=(proc.stderr, stderr),
+                                        daemon=True))
+    for t in readers:
+        t.start()
+    try:
+        resources = wait_process(proc, timeout)
+    except sp.TimeoutExpired:
+        for t in readers:  # a leaked grandchild may keep the pipe open
+            t.join(timeout=5)
+        raise sp.TimeoutExpired(cmd, timeout, output=stdout.text(),
+                                stderr=stderr.text() if stderr else None)
+    for t in readers:
+        t.join()
+    return ProcessOutput(proc.returncode, time.perf_counter() - t0, stdout,
+                         stderr, resources)
+
+
+def open_log(log_dir: Optional[Path], name: str) -> Optional[IO[str]]:
+    """Open ``log_dir/name.log`` for writing (``None`` if no ``log_dir``)."""
+    if log_dir is None:
+        return None
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return open(log_dir / f"{name}.log", "w", encoding="utf-8",
+                errors="replace")
@@ -0,0 +1,136 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Per-process resource accounting for script runs.
+
+The child is reaped with ``os.wait4`` to obtain its rusage (user/system CPU
+time, peak resident memory, page faults, block I/O). On Linux the exited
+child is first waited for with ``WNOWAIT`` so ``/proc/<pid>/io`` can still be
+read from the zombie, which gives exact storage bytes read/written.
+
+Platforms without ``wait4`` (Windows) fall back to a plain wait and report
+no resources.
+
+Used by tools/output_capture.py (and thus both script runners).
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import subprocess as sp
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass
+class Resources:
+    cpu_user: float  # seconds
+    cpu_sys: float  # seconds
+    max_rss_kb: int
+    minor_faults: int
+    major_faults: int
+    read_bytes: int
+    write_bytes: int
+
+    @property
+    def cpu(self) -> float:
+        return self.cpu_user + self.cpu_sys
+
+    @property
+    def max_rss_mb(self) -> float:
+        return self.max_rss_kb / 1024
+
+    def columns(self) -> str:
+        """Fixed-width fragment for one-line console summaries."""
+        return (f"cpu {self.cpu:6.2f}s  rss {self.max_rss_mb:7.1f}MB  "
+                f"io {self.read_bytes / 1e6:.1f}/{self.write_bytes / 1e6:.1f}MB")
+
+    def describe(self) -> str:
+        return (f"cpu {self.cpu_user:.2f}u/{self.cpu_sys:.2f}s, "
+                f"peak RSS {self.max_rss_mb:.1f} MB, "
+                f"faults {self.minor_faults}/{self.major_faults}, "
+                f"io {self.read_bytes / 1e6:.1f}/{self.write_bytes / 1e6:.1f} MB r/w")
+
+
+def _read_proc_io(pid: int) -> Dict[str, int]:
+    try:
+        with open(f"/proc/{pid}/io", encoding="ascii") as fh:
+            pairs = (line.split(":", 1) for line in fh)
+            return {k.strip(): int(v) for k, v in pairs}
+    except (OSError, ValueError):
+        return {}
+
+
+def _from_rusage(ru, io: Dict[str, int]) -> Resources:
+    # ru_maxrss is KiB on Linux but bytes on macOS
+    rss_kb = ru.ru_maxrss // 1024 if sys.platform == "darwin" else ru.ru_maxrss
+    return Resources(
+        cpu_user=ru.ru_utime,
+        cpu_sys=ru.ru_stime,
+        max_rss_kb=int(rss_kb),
+        minor_faults=ru.ru_minflt,
+        major_faults=ru.ru_majflt,
+        read_bytes=io.get("read_bytes", ru.ru_inblock * 512),
+        write_bytes=io.get("write_bytes", ru.ru_oublock * 512),
+    )
+
+
+def wait_pid(pid: int,
+             timeout: Optional[float]) -> Tuple[int, Resources, bool]:
+    """Wait for child ``pid``; return ``(wait status, resources, timed_out)``.
+
+    Once ``timeout`` elapses the child gets SIGKILL and the returned status
+    is that of the killed process. The child is only reaped here, so the pid
+    cannot be recycled before the signal is sent.
+    """
+    timed_out = threading.Event()
+
+    def on_timeout() -> None:
+        timed_out.set()
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    timer = threading.Timer(timeout, on_timeout) if timeout else None
+    if timer is not None:
+        timer.daemon = True
+        timer.start()
+    try:
+        io: Dict[str, int] = {}
+        if hasattr(os, "waitid") and sys.platform.startswith("linux"):
+            os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+            io = _read_proc_io(pid)
+        _, status, ru = os.wait4(pid, 0)
+    finally:
+        if timer is not None:
+            timer.cancel()
+    return status, _from_rusage(ru, io), timed_out.is_set()
+
+
+def wait_process(proc: sp.Popen, timeout: Optional[float]) -> Optional[Resources]:
+    """Wait for ``proc`` like ``proc.wait(timeout)`` and return its resources.
+
+    On timeout the process is killed, reaped and
+    :class:`subprocess.TimeoutExpired` raised, as with ``Popen.wait``.
+    """
+    if not hasattr(os, "wait4"):
+        try:
+            proc.wait(timeout=timeout)
+        except sp.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        return None
+    status, res, timed_out = wait_pid(proc.pid, timeout)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if timed_out:
+        raise sp.TimeoutExpired(proc.args, timeout)
+    return res
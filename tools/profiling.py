@@ -0,0 +1,191 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""CPU profiling of chapter scripts: pstats, top functions, collapsed stacks.
+
+A script is run through this file as a driver,
+
+    python tools/profiling.py --out tools/_profiles/10_pandas_basics code/10_pandas_basics.py
+
+which executes it as ``__main__`` under cProfile while a background thread
+samples the main thread's stack every few milliseconds. It writes
+- ``<out>.pstats``: the cProfile statistics (for ``pstats``/snakeviz), and
+- ``<out>.collapsed``: flamegraph-compatible collapsed stacks
+  (``frame;frame;frame <microseconds>`` lines, as consumed by flamegraph.pl,
+  speedscope or inferno).
+
+cProfile only records caller->callee edges, so the stacks come from the
+sampler instead; both see the same run.
+
+Used by tools/validate_code.py and code/run_all.py (--profile).
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import pstats
+import runpy
+import sys
+import threading
+import traceback
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+PROFILE_DIR = Path(__file__).resolve().parent / "_profiles"
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+_DRIVER_FILES = {"<frozen runpy>", runpy.__file__, __file__}
+
+
+def profile_command(script: Path, out: Path) -> List[str]:
+    """Interpreter arguments that run ``script`` profiled into ``out.*``."""
+    return [sys.executable, str(Path(__file__).resolve()), "--out", str(out),
+            str(script)]
+
+
+def label(func: Tuple[str, int, str]) -> str:
+    """``name (file:line)`` for a pstats/code location; bare name for built-ins."""
+    filename, line, name = func
+    if filename == "~":
+        text = name
+    else:
+        text = f"{name} ({Path(filename).name}:{line})"
+    return text.replace(";", ":")
+
+
+class StackSampler(threading.Thread):
+    """Count the stacks of one thread, sampled every ``interval`` seconds.
+
+    Frames above the first one executing ``script`` (driver, runpy) are
+    dropped, so every stack starts at the script's ``<module>``.
+    """
+
+    def __init__(self, thread_id: int, script: Path,
+                 interval: float = SAMPLE_INTERVAL) -> None:
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.script = {str(script), str(script.resolve())}
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            stack.reverse()
+            for i, (filename, _, _) in enumerate(stack):
+                if filename in self.script:
+                    self.counts[";".join(label(f) for f in stack[i:])] += 1
+                    break
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def stacks(self) -> Dict[str, int]:
+        """Collapsed stacks weighted in microseconds."""
+        us = int(self.interval * 1e6)
+        return {stack: n * us for stack, n in self.counts.items()}
+
+
+def run_profiled(script: Path, out: Path) -> int:
+    """Run ``script`` as ``__main__`` under cProfile and the stack sampler.
+
+    Writes ``out.pstats`` and ``out.collapsed`` even if the script fails and
+    returns the script's exit code.
+    """
+    out.parent.mkdir(parents=True, exist_ok=True)
+    sys.argv = [str(script)]
+    sys.path[0] = str(script.parent)
+    prof = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident(), script)
+    code = 0
+    sampler.start()
+    try:
+        prof.runcall(runpy.run_path, str(script), run_name="__main__")
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            code = exc.code or 0
+        else:
+            print(exc.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        sampler.stop()
+        prof.dump_stats(str(out.with_suffix(".pstats")))
+        write_collapsed(out.with_suffix(".collapsed"), sampler.stacks())
+    return code
+
+
+def write_collapsed(path: Path, stacks: Dict[str, int]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        for stack, us in sorted(stacks.items()):
+            fh.write(f"{stack} {us}\n")
+
+
+def top_functions(pstats_path: Path, n: int = 10) -> List[Dict[str, object]]:
+    """Top ``n`` functions by cumulative time (runpy/driver frames excluded)."""
+    stats = pstats.Stats(str(pstats_path)).stats  # type: ignore[attr-defined]
+    rows = sorted(((func, row) for func, row in stats.items()
+                   if func[0] not in _DRIVER_FILES),
+                  key=lambda kv: -kv[1][3])[:n]
+    return [{"function": label(func), "ncalls": nc, "tottime": tt,
+             "cumtime": ct} for func, (cc, nc, tt, ct, _) in rows]
+
+
+def summarize_profile(out: Path, n: int = 10) -> Optional[dict]:
+    """``{"pstats", "collapsed", "top"}`` for a finished profiled run
+    (``None`` if no profile was written)."""
+    pstats_path = out.with_suffix(".pstats")
+    if not pstats_path.is_file():
+        return None
+    return {"pstats": str(pstats_path),
+            "collapsed": str(out.with_suffix(".collapsed")),
+            "top": top_functions(pstats_path, n)}
+
+
+def format_top(rows: List[Dict[str, object]]) -> List[str]:
+    lines = [f"      {'cumtime':>8} {'tottime':>8} {'ncalls':>8}  function"]
+    for row in rows:
+        lines.append(f"      {row['cumtime']:8.3f} {row['tottime']:8.3f} "
+                     f"{row['ncalls']:8}  {row['function']}")
+    return lines
+
+
+def merge_collapsed(path: Path, parts: Iterable[Tuple[str, Path]]) -> None:
+    """Concatenate per-script collapsed files under their script names."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        for root, part in parts:
+            if not part.is_file():
+                continue
+            for line in part.read_text(encoding="utf-8").splitlines():
+                fh.write(f"{root.replace(';', ':')};{line}\n")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--out", type=Path, required=True,
+                   help="output path stem; writes OUT.pstats and OUT.collapsed")
+    p.add_argument("script", type=Path, help="Python script to profile")
+    args = p.parse_args(list(argv) if argv is not None else None)
+    return run_profiled(args.script, args.out)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
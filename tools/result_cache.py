@@ -0,0 +1,129 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Persistent content-hash cache for script validation results.
+
+A passing run of a chapter script is stored under a key derived from
+- the script's source bytes and kind (py/sh),
+- the interpreter version and platform, and
+- the installed versions of numpy, pandas, matplotlib and scikit-learn.
+
+Any change to one of these produces a new key, so stale entries are simply
+never hit again and age out via eviction. Entries are small JSON files in
+tools/_cache/ (written atomically, so concurrent runners can share them).
+
+Used by tools/validate_code.py and code/run_all.py.
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Optional
+
+
+CACHE_DIR = Path(__file__).resolve().parent / "_cache"
+TRACKED_PACKAGES = ("numpy", "pandas", "matplotlib", "scikit-learn")
+MAX_AGE_DAYS = 7.0
+MAX_SIZE_MB = 50.0
+
+
+def environment_fingerprint() -> Dict[str, object]:
+    """Return the interpreter and package versions results depend on."""
+    packages: Dict[str, Optional[str]] = {}
+    for name in TRACKED_PACKAGES:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    return {"python": sys.version, "platform": sys.platform,
+            "packages": packages}
+
+
+def cache_key(path: Path, kind: str,
+              fingerprint: Optional[Dict[str, object]] = None) -> str:
+    """Hash of script source, kind and environment fingerprint."""
+    h = hashlib.sha256()
+    h.update(kind.encode())
+    h.update(b"\0")
+    h.update(json.dumps(fingerprint or environment_fingerprint(),
+                        sort_keys=True).encode())
+    h.update(b"\0")
+    h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Directory of ``<key>.json`` records for passing script runs."""
+
+    def __init__(self, root: Path = CACHE_DIR,
+                 max_age_days: float = MAX_AGE_DAYS,
+                 max_size_mb: float = MAX_SIZE_MB) -> None:
+        self.root = Path(root)
+        self.max_age = max_age_days * 86_400
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.fingerprint = environment_fingerprint()
+
+    def key(self, path: Path, kind: str) -> str:
+        return cache_key(path, kind, self.fingerprint)
+
+    def _file(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the stored record for ``key`` unless missing or expired."""
+        f = self._file(key)
+        try:
+            record = json.loads(f.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if time.time() - record.get("created", 0) > self.max_age:
+            f.unlink(missing_ok=True)
+            return None
+        return record
+
+    def put(self, key: str, record: dict) -> None:
+        """Store ``record`` atomically (temp file + rename)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        record = dict(record, created=time.time())
+        tmp = self.root / f".{key}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(record, indent=2), encoding="utf-8")
+        os.replace(tmp, self._file(key))
+
+    def evict(self) -> int:
+        """Drop expired entries, then the oldest ones beyond the size cap.
+
+        Returns the number of removed entries.
+        """
+        if not self.root.is_dir():
+            return 0
+        now = time.time()
+        entries = []
+        removed = 0
+        for f in self.root.glob("*.json"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            if now - st.st_mtime > self.max_age:
+                f.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((st.st_mtime, st.st_size, f))
+        total = sum(size for _, size, _ in entries)
+        for _, size, f in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            f.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,131 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Historical run times of chapter scripts and notebooks.
+
+A small JSON file maps item keys (repository-relative POSIX paths such as
+``code/08_numpy_essentials.py`` or ``notebooks/10_Pandas_Basics.ipynb``)
+to a smoothed duration in seconds:
+
+    {"code/08_numpy_essentials.py": 0.41, "notebooks/10_Pandas_Basics.ipynb": 3.2}
+
+New measurements are blended in with an exponential moving average so a
+single noisy run does not reorder everything. Items without history are
+treated as the longest, so they are scheduled first.
+
+For sharding, items are packed greedily (longest processing time first)
+into N groups: each item goes to the group with the smallest load so far,
+items without history counting as the mean known duration. The packing is
+deterministic, so every machine computes the same partition from the same
+timings file. Shards therefore never write the file: each one puts its
+durations into its report, and ``--merge`` checks that every item ran in
+exactly one shard (:func:`check_shards`) before folding them in.
+
+Used by tools/validate_all.py (longest-first scheduling) and by
+tools/validate_code.py / tools/validate_notebooks.py (recording, --shard,
+--merge).
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+
+ROOT = Path(__file__).resolve().parent.parent
+TIMINGS_FILE = Path(__file__).resolve().parent / "_timings.json"
+ALPHA = 0.5  # weight of the newest measurement
+
+
+def item_key(path: Path) -> str:
+    """Repository-relative POSIX path of ``path`` (as given if outside)."""
+    try:
+        return path.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def load_timings(path: Path = TIMINGS_FILE) -> Dict[str, float]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {k: float(v) for k, v in data.items() if isinstance(v, (int, float))}
+
+
+def record_timings(durations: Mapping[str, float], path: Path = TIMINGS_FILE,
+                   alpha: float = ALPHA) -> Dict[str, float]:
+    """Blend ``durations`` into the file at ``path``; return the new table."""
+    timings = load_timings(path)
+    for key, dur in durations.items():
+        old = timings.get(key)
+        timings[key] = dur if old is None else alpha * dur + (1 - alpha) * old
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        json.dump({k: round(v, 3) for k, v in sorted(timings.items())}, fh,
+                  indent=2)
+    os.replace(tmp, path)
+    return timings
+
+
+def longest_first(keys: Iterable[str], timings: Mapping[str, float]) -> List[str]:
+    """``keys`` ordered by expected duration, unknown ones first."""
+    return sorted(keys, key=lambda k: (k in timings, -timings.get(k, 0.0), k))
+
+
+def shard_spec(text: str) -> Tuple[int, int]:
+    """Parse ``"i/N"`` (1 <= i <= N) as used by ``--shard``."""
+    index, _, count = text.partition("/")
+    i, n = int(index), int(count)
+    if not 1 <= i <= n:
+        raise ValueError(f"shard index must be in 1..{n}")
+    return i, n
+
+
+def shard(keys: Iterable[str], timings: Mapping[str, float], index: int,
+          count: int) -> Tuple[List[str], float]:
+    """Keys of shard ``index`` of ``count`` and its estimated duration."""
+    keys = list(dict.fromkeys(keys))
+    known = [timings[k] for k in keys if k in timings]
+    default = sum(known) / len(known) if known else 1.0
+    loads = [0.0] * count
+    groups: List[List[str]] = [[] for _ in range(count)]
+    for key in sorted(keys, key=lambda k: (-timings.get(k, default), k)):
+        target = loads.index(min(loads))
+        groups[target].append(key)
+        loads[target] += timings.get(key, default)
+    members = set(groups[index - 1])
+    return [k for k in keys if k in members], loads[index - 1]
+
+
+def check_shards(reports: Iterable[Tuple[str, Sequence[str], Sequence[str]]]
+                 ) -> List[str]:
+    """Problems with a set of shard reports (empty list: they add up).
+
+    Each report is ``(shard, items, ran)``: its ``"I/N"`` label, the keys
+    of all items the partition was computed from, and the keys it has
+    results for. Every item must have run in exactly one shard.
+    """
+    counts = set()
+    items: set = set()
+    where: Dict[str, List[str]] = {}
+    for label, keys, ran in reports:
+        counts.add(label.partition("/")[2])
+        items.update(keys)
+        for key in ran:
+            where.setdefault(key, []).append(label)
+    problems = []
+    if len(counts) > 1:
+        problems.append(f"reports of different shard counts ({', '.join(sorted(counts))})")
+    problems += [f"{key} ran in more than one shard ({', '.join(labels)})"
+                 for key, labels in sorted(where.items()) if len(labels) > 1]
+    problems += [f"{key} ran in no shard" for key in sorted(items - set(where))]
+    return problems
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Validate chapter scripts and notebooks together on one asyncio scheduler.
+
+Features
+- Discovers code/NN_*.py (and NN_*.sh with --with-bash) plus notebooks/*.ipynb
+- Runs scripts as asyncio subprocesses and notebooks with nbclient (or the
+  kernel-less engine) on one event loop under a single --jobs limit
+- Schedules longest-first from recorded durations (tools/_timings.json, see
+  tools/timings.py), so the wall time approaches that of the slowest item
+- Reuses cached script results (tools/_cache/) and, with --incremental,
+  unchanged notebooks
+- Prints one combined summary; optional JSON/Markdown reports
+
+Usage
+  python tools/validate_all.py
+  python tools/validate_all.py --jobs 4 --with-bash --report-md tools/all_report.md
+  python tools/validate_all.py --engine inproc --incremental
+  python tools/validate_all.py --no-notebooks
+
+Requirements
+  pip install nbclient nbformat (for notebooks)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import codecs
+import json
+import os
+import subprocess as sp
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional
+
+from output_capture import MAX_LINE, OutputCapture, console_lock
+from result_cache import ResultCache
+from timings import TIMINGS_FILE, item_key, load_timings, longest_first, record_timings
+from validate_code import script_command
+
+
+@dataclass
+class Item:
+    kind: str  # "py", "sh" or "nb"
+    path: Path
+
+    @property
+    def key(self) -> str:
+        return item_key(self.path)
+
+
+@dataclass
+class Outcome:
+    item: str
+    kind: str
+    ok: bool
+    duration: float
+    status: str  # OK, OK(cached), FAIL(rc), TIMEOUT, ...
+    start: float = 0.0  # seconds after the run started
+    detail: str = ""  # output tail or failure description
+
+
+def discover(with_bash: bool, scripts: bool, notebooks: bool,
+             exclude: Iterable[str]) -> List[Item]:
+    items: List[Item] = []
+    if scripts:
+        items += [Item("py", p) for p in sorted(Path("code").glob("[0-9][0-9]_*.py"))]
+        if with_bash:
+            items += [Item("sh", p) for p in sorted(Path("code").glob("[0-9][0-9]_*.sh"))]
+    if notebooks:
+        items += [Item("nb", p) for p in sorted(Path("notebooks").glob("*.ipynb"))]
+    excluded = {p.resolve() for pat in exclude for p in Path().glob(pat)}
+    return [it for it in items if it.path.resolve() not in excluded]
+
+
+def _emit(lines: List[str]) -> None:
+    with console_lock:
+        print("\n".join(lines), flush=True)
+
+
+async def _pump(stream: asyncio.StreamReader, capture: OutputCapture) -> None:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        chunk = await stream.read(MAX_LINE)
+        if not chunk:
+            break
+        capture.feed(decoder.decode(chunk))
+
+
+async def run_script(item: Item, timeout: float,
+                     cache: Optional[ResultCache], refresh: bool) -> Outcome:
+    key = cache.key(item.path, item.kind) if cache else None
+    if cache and not refresh:
+        hit = cache.get(key)
+        if hit is not None:
+            return Outcome(item.key, item.kind, True, hit["duration"], "OK(cached)")
+    cmd, env = script_command(item.kind, item.path)
+    t0 = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, env=env, stdin=sp.DEVNULL, stdout=sp.PIPE, stderr=sp.STDOUT)
+    out = OutputCapture(head=2_000, tail=3_000)
+    try:
+        await asyncio.wait_for(asyncio.gather(_pump(proc.stdout, out), proc.wait()),
+                               timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return Outcome(item.key, item.kind, False, time.perf_counter() - t0,
+                       "TIMEOUT", detail=out.tail.strip())
+    dur = time.perf_counter() - t0
+    ok = proc.returncode == 0
+    if cache and ok:
+        cache.put(key, {"path": str(item.path), "kind": item.kind,
+                        "duration": dur, "stdout": out.tail})
+    return Outcome(item.key, item.kind, ok, dur,
+                   "OK" if ok else f"FAIL({proc.returncode})",
+                   detail="" if ok else out.text().strip())
+
+
+async def run_notebook(item: Item, timeout: float, kernel: str,
+                       exec_dir: Path, incremental: bool,
+                       engine: str) -> Outcome:
+    # imported here so that --no-notebooks works without nbclient
+    from validate_notebooks import async_execute_notebook
+
+    try:
+        res = await async_execute_notebook(item.path, int(timeout), kernel,
+                                           exec_dir, incremental=incremental,
+                                           engine=engine)
+    except Exception as exc:  # timeouts, dead kernels
+        return Outcome(item.key, "nb", False, timeout, "ERROR",
+                       detail=f"{type(exc).__name__}: {exc}")
+    detail = ""
+    if res.failure:
+        f = res.failure
+        detail = f"cell {f.cell_index}: {f.ename}: {f.evalue}\n{f.snippet}"
+    status = "OK(cached)" if res.cached else "OK" if res.ok else "FAIL"
+    return Outcome(item.key, "nb", res.ok, res.duration, status, detail=detail)
+
+
+async def run_all(items: List[Item], jobs: int, fail_fast: bool,
+                  timings: Dict[str, float], script_timeout: float,
+                  nb_timeout: float, kernel: str = "python3",
+                  exec_dir: Path = Path("tools/_executed"),
+                  cache: Optional[ResultCache] = None, refresh: bool = False,
+                  incremental: bool = False,
+                  engine: str = "kernel") -> List[Outcome]:
+    """Run ``items`` longest-first on ``jobs`` workers sharing one loop.
+
+    Each worker takes the next item from a queue ordered by expected
+    duration, so long items start early and short ones fill the gaps.
+    With ``fail_fast`` no new item starts after the first failure.
+    """
+    by_key = {it.key: it for it in items}
+    queue: Deque[Item] = deque(by_key[k] for k in longest_first(by_key, timings))
+    outcomes: List[Outcome] = []
+    failed = False
+    t_start = time.perf_counter()
+
+    async def worker() -> None:
+        nonlocal failed
+        while queue and not (fail_fast and failed):
+            item = queue.popleft()
+            start = time.perf_counter() - t_start
+            if item.kind == "nb":
+                res = await run_notebook(item, nb_timeout, kernel, exec_dir,
+                                         incremental, engine)
+            else:
+                res = await run_script(item, script_timeout, cache, refresh)
+            res.start = start
+            outcomes.append(res)
+            lines = [f"[{res.kind}] {res.item} -> {res.status} ({res.duration:.2f}s)"]
+            if res.detail and not res.ok:
+                lines.append(res.detail)
+            _emit(lines)
+            failed = failed or not res.ok
+
+    await asyncio.gather(*(worker() for _ in range(max(1, jobs))))
+    return outcomes
+
+
+def print_summary(outcomes: List[Outcome], wall: float, jobs: int) -> None:
+    print("\nCombined validation summary:")
+    for r in sorted(outcomes, key=lambda r: (r.kind == "nb", r.item)):
+        print(f"  {r.kind} {r.item:52} {r.status:10} {r.duration:6.2f}s"
+              f"  (started +{r.start:.1f}s)")
+    ran = [r.duration for r in outcomes if not r.status.endswith("(cached)")]
+    busy = sum(ran)
+    longest = max(ran, default=0.0)
+    bound = max(longest, busy / max(1, jobs))
+    print(f"\nWall time {wall:.2f}s on {jobs} job(s); item time {busy:.2f}s, "
+          f"longest item {longest:.2f}s, lower bound {bound:.2f}s")
+    passed = sum(r.ok for r in outcomes)
+    print(f"Passed {passed}/{len(outcomes)} items")
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__,
+                                formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                   help="items to run concurrently (default: CPU count)")
+    p.add_argument("--with-bash", action="store_true",
+                   help="also run bash scripts (dry-run)")
+    p.add_argument("--no-scripts", action="store_true", help="skip code/ scripts")
+    p.add_argument("--no-notebooks", action="store_true", help="skip notebooks")
+    p.add_argument("--exclude", action="append", default=[],
+                   help="globs to exclude")
+    p.add_argument("--timeout", type=float, default=60.0,
+                   help="timeout per script process in seconds (default: 60)")
+    p.add_argument("--nb-timeout", type=float, default=300.0,
+                   help="timeout per notebook cell in seconds, as in "
+                        "validate_notebooks.py; a notebook as a whole has no "
+                        "limit (default: 300)")
+    p.add_argument("--kernel", default="python3",
+                   help="Jupyter kernel name (default: python3)")
+    p.add_argument("--engine", choices=("kernel", "inproc"), default="kernel",
+                   help="notebook engine, see validate_notebooks.py (default: kernel)")
+    p.add_argument("--incremental", action="store_true",
+                   help="skip notebooks unchanged since their last passing run")
+    p.add_argument("--no-cache", action="store_true",
+                   help="do not read or write the script result cache")
+    p.add_argument("--refresh", action="store_true",
+                   help="re-run every script and overwrite cached results")
+    p.add_argument("--timings", type=Path, default=TIMINGS_FILE,
+                   help="duration history used for ordering and updated after "
+                        "the run (default: tools/_timings.json)")
+    p.add_argument("--fail-fast", action="store_true",
+                   help="start nothing new after the first failure")
+    p.add_argument("--report-json", type=Path, help="write a JSON report")
+    p.add_argument("--report-md", type=Path, help="write a Markdown report")
+    args = p.parse_args(list(argv) if argv is not None else None)
+
+    items = discover(args.with_bash, not args.no_scripts, not args.no_notebooks,
+                     args.exclude)
+    if not items:
+        print("Nothing to validate")
+        return 1
+    cache = None if args.no_cache else ResultCache()
+    if cache:
+        cache.evict()
+    timings = load_timings(args.timings)
+    t0 = time.perf_counter()
+    outcomes = asyncio.run(run_all(
+        items, args.jobs, args.fail_fast, timings, args.timeout,
+        args.nb_timeout, args.kernel, cache=cache, refresh=args.refresh,
+        incremental=args.incremental, engine=args.engine))
+    wall = time.perf_counter() - t0
+    record_timings({r.item: r.duration for r in outcomes
+                    if r.ok and not r.status.endswith("(cached)")}, args.timings)
+
+    print_summary(outcomes, wall, args.jobs)
+
+    if args.report_json:
+        payload = {"wall": wall, "jobs": args.jobs,
+                   "items": [asdict(r) for r in outcomes]}
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(json.dumps(payload, indent=2))
+
+    if args.report_md:
+        lines = ["# Primer Validation Report", "",
+                 f"Wall time {wall:.2f}s on {args.jobs} job(s).", ""]
+        for r in sorted(outcomes, key=lambda r: (r.kind == "nb", r.item)):
+            mark = "✅" if r.ok else "❌"
+            lines.append(f"- {mark} {r.status} `{r.item}` — {r.duration:.2f}s")
+        fails = [r for r in outcomes if not r.ok]
+        if fails:
+            lines.append("\n## Failures")
+            for r in fails:
+                lines.append(f"\n### {r.item}")
+                if r.detail:
+                    lines.append("\n```\n" + r.detail + "\n```")
+        args.report_md.parent.mkdir(parents=True, exist_ok=True)
+        args.report_md.write_text("\n".join(lines))
+
+    return 0 if all(r.ok for r in outcomes) and len(outcomes) == len(items) else 2
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
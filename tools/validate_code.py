@@ -9,15 +9,43 @@ Features
 - Discovers code scripts (NN_*.py) and runs them with the current interpreter.
 - Optionally runs bash scripts (NN_*.sh) with PRIMER_DRY_RUN=1 for safety.
 - Per-script timeout, fail-fast, include/exclude globs
+- Runs scripts concurrently (--jobs, default: CPU count) with grouped output
+- Streams output with bounded memory (head + tail kept); optional live
+  prefixed lines (--stream) and full per-script logs (--log-dir)
+- Records per-script CPU time, peak RSS, page faults and I/O bytes
+- Import-time profiling (--import-profile) with an optional startup budget
+- Benchmark mode (--bench) with warmups/repeats, min/median/p95/stdev and
+  baseline regression checks (--bench-save / --bench-baseline)
+- CPU profiling (--profile): .pstats and flamegraph-compatible collapsed
+  stacks per script (plus <report>.collapsed next to --report-json)
+- Reuses passing results of unchanged scripts from tools/_cache/
+  (--no-cache to bypass, --refresh to re-run and overwrite)
+- Change-aware selection (--changed-since REF): only scripts whose own
+  source, local imports or referenced files changed (see tools/depgraph.py)
+- Sharding across machines (--shard I/N) balanced by the durations recorded
+  in tools/_timings.json; --merge combines the per-shard JSON reports,
+  checks that every script ran in exactly one shard and records the
+  durations (shards themselves leave the timings file alone)
+- Run history (--history): appends durations and resources per script, with
+  git commit and environment, to tools/_history.sqlite (see tools/history.py)
 - Prints a detailed summary; optional JSON/Markdown reports
 
 Usage
   python tools/validate_code.py
   python tools/validate_code.py --with-bash --timeout 90 \
       --report-json tools/code_report.json --report-md tools/code_report.md
+  python tools/validate_code.py --jobs 1      # strictly sequential
+  python tools/validate_code.py --import-profile --import-budget 1.5
+  python tools/validate_code.py --bench --repeat 7 --bench-save tools/bench_base.json
+  python tools/validate_code.py --bench --bench-baseline tools/bench_base.json
+  python tools/validate_code.py --profile --report-json tools/code_report.json
+  python tools/validate_code.py --changed-since origin/main
+  python tools/validate_code.py --shard 2/4 --report-json shard2.json
+  python tools/validate_code.py --merge shard*.json --report-md tools/code_report.md
+  python tools/validate_code.py --history
 
 Requirements
-  Standard library only.
+  Standard library only (plus the helper modules next to this file).
 """
 
 from __future__ import annotations
@@ -27,10 +55,23 @@ import json
 import os
 import subprocess as sp
 import sys
-import time
-from dataclasses import asdict, dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, fields
+from functools import partial
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from output_capture import OutputCapture, console_lock, open_log, run_process
+from depgraph import GitError, affected, changed_files, print_selection
+from bench import compare, format_row, load_baseline, save_baseline, summarize
+from history import HISTORY_DB, ItemRun, record_run
+from import_profile import ImportTimeParser
+from proc_usage import Resources
+from profiling import (PROFILE_DIR, format_top, merge_collapsed,
+                       profile_command, summarize_profile)
+from result_cache import ResultCache
+from timings import (TIMINGS_FILE, check_shards, item_key, load_timings,
+                     record_timings, shard, shard_spec)
 
 
 @dataclass
@@ -41,6 +82,23 @@ class Result:
     duration: float
     returncode: int
     stdout: Optional[str] = None
+    cached: bool = False
+    resources: Optional[Resources] = None
+    imports: Optional[dict] = None  # ImportTimeParser.summary()
+    over_budget: bool = False  # import time exceeded --import-budget
+    bench: Optional[dict] = None  # bench.summarize() plus "change" vs baseline
+    regressed: bool = False  # slower than the --bench-baseline allows
+    profile: Optional[dict] = None  # profiling.summarize_profile()
+
+
+# Serializes console output so each script's block stays together when
+# several scripts run concurrently (shared with live --stream lines).
+_print_lock = console_lock
+
+
+def _emit(lines: List[str]) -> None:
+    with _print_lock:
+        print("\n".join(lines), flush=True)
 
 
 def discover(patterns: Iterable[str]) -> List[Path]:
@@ -54,34 +112,231 @@ def discover(patterns: Iterable[str]) -> List[Path]:
     return [p for p in paths if p.is_file()]
 
 
-def run_py(path: Path, timeout: int) -> Result:
+def _run_script(kind: str, cmd: List[str], path: Path, env: dict,
+                timeout: int, stream: bool = False,
+                log_dir: Optional[Path] = None,
+                stderr_hook: Optional[Callable[[str], bool]] = None) -> Result:
+    """Run ``cmd`` with bounded, streaming output capture.
+
+    Output is read incrementally: only the head and tail are kept in memory,
+    lines are echoed live with a ``[name]`` prefix when ``stream`` is set,
+    and the full log goes to ``log_dir/<name>.log`` when given. stderr lines
+    for which ``stderr_hook`` returns true are consumed by the hook.
+    """
+    prefix = path.name if stream else None
+    log = open_log(log_dir, path.name)
+    out = OutputCapture(prefix=prefix, log=log)
+    err = OutputCapture(head=5_000, tail=2_000, prefix=prefix, log=log,
+                        on_line=stderr_hook)
+    try:
+        proc = run_process(cmd, env, timeout, out, err)
+    finally:
+        if log is not None:
+            log.close()
+    lines = [f"[{kind}] {path} -> rc={proc.returncode} ({proc.duration:.2f}s)"]
+    if out.total and not stream:
+        lines.append(out.text().strip())
+    if err.total and proc.returncode != 0 and not stream:
+        lines.append(err.text().strip())
+    _emit(lines)
+    return Result(str(path), kind, proc.returncode == 0, proc.duration,
+                  proc.returncode, out.tail, resources=proc.resources)
+
+
+def script_command(kind: str, path: Path) -> Tuple[List[str], dict]:
+    """Command line and environment that run script ``path`` of ``kind``
+    ("py" headless, "sh" as a dry run)."""
     env = os.environ.copy()
+    if kind == "sh":
+        env.setdefault("PRIMER_DRY_RUN", "1")
+        return ["bash", str(path)], env
     env.setdefault("MPLBACKEND", "Agg")
-    t0 = time.perf_counter()
-    proc = sp.run([sys.executable, str(path)], env=env, text=True, capture_output=True, timeout=timeout)
-    dur = time.perf_counter() - t0
-    print(f"[py] {path} -> rc={proc.returncode} ({dur:.2f}s)")
-    if proc.stdout:
-        print(proc.stdout.strip()[:10_000])
-    if proc.stderr and proc.returncode != 0:
-        print(proc.stderr.strip()[:5_000])
-    return Result(str(path), "py", proc.returncode == 0, dur, proc.returncode,
-                  (proc.stdout or "")[-5_000:])
-
-
-def run_sh(path: Path, timeout: int) -> Result:
-    env = os.environ.copy()
-    env.setdefault("PRIMER_DRY_RUN", "1")
-    t0 = time.perf_counter()
-    proc = sp.run(["bash", str(path)], env=env, text=True, capture_output=True, timeout=timeout)
-    dur = time.perf_counter() - t0
-    print(f"[sh] {path} -> rc={proc.returncode} ({dur:.2f}s)")
-    if proc.stdout:
-        print(proc.stdout.strip()[:10_000])
-    if proc.stderr and proc.returncode != 0:
-        print(proc.stderr.strip()[:5_000])
-    return Result(str(path), "sh", proc.returncode == 0, dur, proc.returncode,
-                  (proc.stdout or "")[-5_000:])
+    return [sys.executable, str(path)], env
+
+
+def run_py(path: Path, timeout: int, stream: bool = False,
+           log_dir: Optional[Path] = None, import_profile: int = 0,
+           profile_dir: Optional[Path] = None, profile_top: int = 10) -> Result:
+    """Run a Python script.
+
+    With ``import_profile`` > 0 it runs under ``-X importtime`` and keeps that
+    many top-level imports in ``imports``; with ``profile_dir`` it runs under
+    cProfile, saving ``<stem>.pstats``/``.collapsed`` there (see
+    tools/profiling.py) and keeping the top functions in ``profile``.
+    """
+    cmd, env = script_command("py", path)
+    out = None
+    if profile_dir is not None:
+        out = profile_dir / path.stem
+        out.with_suffix(".pstats").unlink(missing_ok=True)
+        cmd = profile_command(path, out)
+    parser = None
+    if import_profile:
+        parser = ImportTimeParser()
+        cmd[1:1] = ["-X", "importtime"]
+    res = _run_script("py", cmd, path, env, timeout, stream, log_dir,
+                      parser.feed if parser else None)
+    if parser is not None:
+        res.imports = parser.summary(import_profile)
+    if out is not None:
+        res.profile = summarize_profile(out, profile_top)
+    return res
+
+
+def run_sh(path: Path, timeout: int, stream: bool = False,
+           log_dir: Optional[Path] = None) -> Result:
+    cmd, env = script_command("sh", path)
+    return _run_script("sh", cmd, path, env, timeout, stream, log_dir)
+
+
+def bench_one(path: Path, timeout: int, warmup: int = 1, repeat: int = 5,
+              baseline: Optional[Dict[str, dict]] = None,
+              threshold: float = 0.10, stat: str = "median") -> Result:
+    """Time ``warmup + repeat`` runs of a script; keep stats of the last ``repeat``.
+
+    The result's ``duration`` is the median. If ``baseline`` has an entry for
+    the script and ``stat`` grew by more than ``threshold``, the result is
+    marked as a regression (and not ok).
+    """
+    kind = "sh" if path.suffix == ".sh" else "py"
+    cmd, env = script_command(kind, path)
+    samples: List[float] = []
+    try:
+        for i in range(warmup + repeat):
+            proc = run_process(cmd, env, timeout, OutputCapture(),
+                               OutputCapture(head=5_000, tail=2_000))
+            if proc.returncode != 0:
+                _emit([f"[{kind}] {path} -> rc={proc.returncode} (benchmark run {i + 1})",
+                       proc.stderr.text().strip()])
+                return Result(str(path), kind, False, proc.duration,
+                              proc.returncode, proc.stdout.tail,
+                              resources=proc.resources)
+            if i >= warmup:
+                samples.append(proc.duration)
+    except sp.TimeoutExpired:
+        _emit([f"[{kind}] {path.name} timed out ({timeout}s)"])
+        return Result(str(path), kind, False, float(timeout), 124)
+    stats = summarize(samples)
+    change = compare(stats, (baseline or {}).get(path.name), threshold, stat)
+    stats["change"] = change
+    res = Result(str(path), kind, True, stats["median"], 0, proc.stdout.tail,
+                 resources=proc.resources, bench=stats)
+    if change is not None and change > threshold:
+        res.ok = False
+        res.regressed = True
+    _emit([f"[bench]{format_row(path.name, stats, change, threshold)[1:]}"])
+    return res
+
+
+def run_one(path: Path, timeout: int, cache: Optional[ResultCache] = None,
+            refresh: bool = False, stream: bool = False,
+            log_dir: Optional[Path] = None, import_profile: int = 0,
+            import_budget: Optional[float] = None,
+            profile_dir: Optional[Path] = None, profile_top: int = 10) -> Result:
+    kind = "sh" if path.suffix == ".sh" else "py"
+    key = cache.key(path, kind) if cache else None
+    if cache and not refresh:
+        hit = cache.get(key)
+        if hit is not None:
+            _emit([f"[{kind}] {path} -> cached OK ({hit['duration']:.2f}s)"])
+            res = hit.get("resources")
+            return Result(str(path), kind, True, hit["duration"], 0,
+                          hit.get("stdout"), cached=True,
+                          resources=Resources(**res) if res else None)
+    try:
+        if kind == "sh":
+            res = run_sh(path, timeout, stream, log_dir)
+        else:
+            res = run_py(path, timeout, stream, log_dir, import_profile,
+                         profile_dir, profile_top)
+    except sp.TimeoutExpired:
+        _emit([f"[{kind}] {path.name} timed out ({timeout}s)"])
+        return Result(str(path), kind, False, float(timeout), 124)
+    if (res.imports and import_budget is not None
+            and res.imports["total"] > import_budget):
+        res.ok = False
+        res.over_budget = True
+    if cache and res.ok:
+        cache.put(key, {"path": res.path, "kind": kind,
+                        "duration": res.duration, "stdout": res.stdout,
+                        "resources": asdict(res.resources) if res.resources else None})
+    return res
+
+
+def run_scripts(scripts: List[Path], jobs: int, fail_fast: bool,
+                run: Callable[[Path], Result]) -> List[Result]:
+    """Run ``scripts`` with ``run`` on up to ``jobs`` worker threads.
+
+    Work is handed out lazily, one script per free slot, so with ``fail_fast``
+    nothing new starts once a failure has been seen (scripts already running
+    are allowed to finish). Results come back in discovery order.
+    """
+    done: dict[int, Result] = {}
+    pending = iter(enumerate(scripts))
+    failed = False
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        running = {}
+        while True:
+            while not (fail_fast and failed) and len(running) < jobs:
+                item = next(pending, None)
+                if item is None:
+                    break
+                idx, path = item
+                running[pool.submit(run, path)] = idx
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                res = fut.result()
+                done[running.pop(fut)] = res
+                failed = failed or not res.ok
+    return [done[i] for i in sorted(done)]
+
+
+def _status(r: Result) -> str:
+    if r.cached:
+        return "OK(cached)"
+    if r.over_budget:
+        return "SLOW(imp)"
+    if r.regressed:
+        return "REGRESSED"
+    return "OK" if r.ok else f"FAIL({r.returncode})"
+
+
+def print_import_profile(results: List[Result],
+                         budget: Optional[float] = None) -> None:
+    profiled = [r for r in results if r.imports]
+    if not profiled:
+        return
+    print("\nImport-time profile (top imports per script):")
+    for r in profiled:
+        total = r.imports["total"]
+        flag = f"  > budget {budget:.2f}s" if r.over_budget else ""
+        print(f"  {Path(r.path).name:28} total {total:6.3f}s{flag}")
+        for node in r.imports["top"]:
+            print(f"      {node['cumulative']:6.3f}s  {node['module']}")
+            for child in node.get("children", [])[:3]:
+                print(f"        {child['cumulative']:6.3f}s  {child['module']}")
+
+
+def print_profiles(results: List[Result]) -> None:
+    profiled = [r for r in results if r.profile]
+    if not profiled:
+        return
+    print("\nCPU profile (top functions by cumulative time):")
+    for r in profiled:
+        print(f"  {Path(r.path).name}  ->  {r.profile['pstats']}")
+        print("\n".join(format_top(r.profile["top"])))
+
+
+def print_bench(results: List[Result], threshold: float) -> None:
+    benched = [r for r in results if r.bench]
+    if not benched:
+        return
+    print("\nBenchmark (seconds per run):")
+    for r in benched:
+        print(format_row(Path(r.path).name, r.bench, r.bench.get("change"),
+                         threshold))
 
 
 def print_summary(results: List[Result]) -> None:
@@ -89,11 +344,142 @@ def print_summary(results: List[Result]) -> None:
     passed = sum(1 for r in results if r.ok)
     print("\nCode validation summary:")
     for r in results:
-        status = "OK" if r.ok else f"FAIL({r.returncode})"
-        print(f"  {Path(r.path).name:28} {r.kind:2} {status:10} {r.duration:6.2f}s")
+        status = _status(r)
+        usage = f"  {r.resources.columns()}" if r.resources else ""
+        print(f"  {Path(r.path).name:28} {r.kind:2} {status:10} {r.duration:6.2f}s{usage}")
     print(f"\nPassed {passed}/{total} scripts")
 
 
+def load_reports(paths: Iterable[Path]
+                 ) -> Tuple[List[Result], List[Tuple[str, List[str], List[Result]]]]:
+    """Results from JSON reports written by --report-json, plus one
+    ``(shard, items, results)`` entry per report written with --shard."""
+    names = {f.name for f in fields(Result)}
+    results = []
+    shards = []
+    for path in paths:
+        data = json.loads(path.read_text())
+        own = []
+        for d in data["results"] if isinstance(data, dict) else data:
+            d = {k: v for k, v in d.items() if k in names}
+            if d.get("resources"):
+                d["resources"] = Resources(**d["resources"])
+            own.append(Result(**d))
+        if isinstance(data, dict):
+            shards.append((data["shard"], data["items"], own))
+        results += own
+    return sorted(results, key=lambda r: r.path), shards
+
+
+def merge_reports(paths: Iterable[Path], args: argparse.Namespace) -> int:
+    """--merge: one summary for several reports.
+
+    Shard reports must add up (every item in exactly one shard); only then
+    are their durations folded into the timings file.
+    """
+    results, shards = load_reports(paths)
+    problems = check_shards((label, items, [item_key(Path(r.path)) for r in rs])
+                            for label, items, rs in shards)
+    if shards and not problems:
+        record_timings({item_key(Path(r.path)): r.duration
+                        for _, _, rs in shards for r in rs
+                        if r.ok and not r.cached}, args.timings)
+    rc = finish(results, args)
+    if problems:
+        print(f"\nShard reports do not add up; {args.timings} not updated:")
+        for msg in problems:
+            print(f"  {msg}")
+        return 2
+    return rc
+
+
+def finish(results: List[Result], args: argparse.Namespace,
+           shard_items: Optional[List[str]] = None) -> int:
+    """Print the summaries and write the reports; return the exit code.
+
+    With ``--shard`` the JSON report also names the shard and all items
+    the partition was computed from (``shard_items``), for --merge.
+    """
+    rc = 0 if all(r.ok for r in results) else 2
+
+    print_summary(results)
+    print_import_profile(results, args.import_budget)
+    print_bench(results, args.bench_threshold)
+    print_profiles(results)
+    if args.bench and args.bench_save:
+        save_baseline(args.bench_save, {
+            Path(r.path).name: {k: v for k, v in r.bench.items() if k != "change"}
+            for r in results if r.bench})
+        print(f"\nSaved benchmark baseline to {args.bench_save}")
+
+    # Reports
+    if args.report_json:
+        payload = [
+            {
+                "path": r.path,
+                "kind": r.kind,
+                "ok": r.ok,
+                "duration": r.duration,
+                "returncode": r.returncode,
+                "cached": r.cached,
+                "resources": asdict(r.resources) if r.resources else None,
+                "imports": r.imports,
+                "over_budget": r.over_budget,
+                "bench": r.bench,
+                "regressed": r.regressed,
+                "profile": r.profile,
+            }
+            for r in results
+        ]
+        if args.shard:
+            payload = {"shard": "{}/{}".format(*args.shard),
+                       "items": shard_items or [], "results": payload}
+        args.report_json.parent.mkdir(parents=True, exist_ok=True)
+        args.report_json.write_text(json.dumps(payload, indent=2))
+        if any(r.profile for r in results):
+            # all scripts' stacks in one flamegraph, one root frame per script
+            merge_collapsed(args.report_json.with_suffix(".collapsed"),
+                            [(Path(r.path).name, Path(r.profile["collapsed"]))
+                             for r in results if r.profile])
+
+    if args.report_md:
+        lines = ["# Code Validation Report", ""]
+        for r in results:
+            status = ("✅ OK (cached)" if r.cached else "✅ OK" if r.ok
+                      else "❌ SLOW IMPORTS" if r.over_budget
+                      else "❌ REGRESSED" if r.regressed
+                      else f"❌ FAIL ({r.returncode})")
+            usage = f" ({r.resources.describe()})" if r.resources else ""
+            if r.bench:
+                b = r.bench
+                usage = (f" (median of {b['n']}; min {b['min']:.3f}s, "
+                         f"p95 {b['p95']:.3f}s, sd {b['stdev']:.3f}s"
+                         + (f", {b['change']:+.1%} vs baseline"
+                            if b.get("change") is not None else "") + ")")
+            lines.append(f"- {status} `{Path(r.path).name}` — {r.duration:.2f}s{usage}")
+        profiled = [r for r in results if r.profile]
+        if profiled:
+            lines.append("\n## CPU profile")
+            for r in profiled:
+                lines.append(f"\n### {Path(r.path).name}")
+                lines.append("\n| cumtime | tottime | ncalls | function |")
+                lines.append("|---:|---:|---:|---|")
+                for row in r.profile["top"]:
+                    lines.append(f"| {row['cumtime']:.3f} | {row['tottime']:.3f} "
+                                 f"| {row['ncalls']} | `{row['function']}` |")
+        profiled = [r for r in results if r.imports]
+        if profiled:
+            lines.append("\n## Import-time profile")
+            for r in profiled:
+                lines.append(f"\n### {Path(r.path).name} — {r.imports['total']:.3f}s")
+                for node in r.imports["top"]:
+                    lines.append(f"- `{node['module']}` {node['cumulative']:.3f}s")
+        args.report_md.parent.mkdir(parents=True, exist_ok=True)
+        args.report_md.write_text("\n".join(lines))
+
+    return rc
+
+
 def main(argv: Optional[Iterable[str]] = None) -> int:
     p = argparse.ArgumentParser(description=__doc__)
     p.add_argument("--include", action="append", default=["code/[0-9][0-9]_*.py"],
@@ -106,6 +492,70 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
                    help="per-script timeout in seconds (default: 60)")
     p.add_argument("--fail-fast", action="store_true",
                    help="stop at first failure")
+    p.add_argument("--changed-since", metavar="REF",
+                   help="only run scripts affected by changes since git REF "
+                        "(own source, local imports, referenced tracked files, "
+                        "requirements; untracked files are ignored)")
+    p.add_argument("--shard", type=shard_spec, metavar="I/N",
+                   help="run only shard I of N, balanced by recorded durations")
+    p.add_argument("--timings", type=Path, default=TIMINGS_FILE,
+                   help="duration history used by --shard and updated after each "
+                        "unsharded run or --merge of shard reports "
+                        "(default: tools/_timings.json)")
+    p.add_argument("--history", type=Path, nargs="?", const=HISTORY_DB,
+                   metavar="DB",
+                   help="append this run to a SQLite history "
+                        "(default DB: tools/_history.sqlite)")
+    p.add_argument("--merge", type=Path, nargs="+", metavar="REPORT",
+                   help="combine --report-json files (e.g. of all shards) into "
+                        "one summary and report instead of running anything; "
+                        "fails if shards overlap or miss items")
+    p.add_argument("--jobs", "-j", type=int,
+                   help="number of scripts to run concurrently "
+                        "(default: CPU count; 1 with --bench)")
+    p.add_argument("--stream", action="store_true",
+                   help="echo script output live, line by line, prefixed by script name")
+    p.add_argument("--log-dir", type=Path,
+                   help="write each script's full output to LOG_DIR/<script>.log")
+    p.add_argument("--import-profile", action="store_true",
+                   help="run Python scripts with -X importtime and report the "
+                        "slowest imports per script (bypasses the cache)")
+    p.add_argument("--import-top", type=int, default=5,
+                   help="number of top-level imports to report per script (default: 5)")
+    p.add_argument("--import-budget", type=float,
+                   help="with --import-profile: fail scripts whose total import "
+                        "time exceeds this many seconds")
+    p.add_argument("--bench", action="store_true",
+                   help="benchmark mode: time repeated runs of each script "
+                        "(bypasses the cache)")
+    p.add_argument("--warmup", type=int, default=1,
+                   help="with --bench: untimed runs per script (default: 1)")
+    p.add_argument("--repeat", type=int, default=5,
+                   help="with --bench: timed runs per script (default: 5)")
+    p.add_argument("--bench-save", type=Path,
+                   help="with --bench: write the timing stats as a baseline JSON")
+    p.add_argument("--bench-baseline", type=Path,
+                   help="with --bench: compare against this baseline JSON")
+    p.add_argument("--bench-threshold", type=float, default=0.10,
+                   help="relative slowdown counted as regression (default: 0.10)")
+    p.add_argument("--bench-stat", choices=("min", "median", "p95"),
+                   default="median",
+                   help="statistic compared with the baseline (default: median)")
+    p.add_argument("--profile", action="store_true",
+                   help="run Python scripts under cProfile; save .pstats and "
+                        "collapsed stacks per script (bypasses the cache)")
+    p.add_argument("--profile-dir", type=Path, default=PROFILE_DIR,
+                   help="where --profile writes its files (default: tools/_profiles)")
+    p.add_argument("--profile-top", type=int, default=10,
+                   help="functions to list per script with --profile (default: 10)")
+    p.add_argument("--no-cache", action="store_true",
+                   help="do not read or write the result cache (tools/_cache/)")
+    p.add_argument("--refresh", action="store_true",
+                   help="re-run every script and overwrite cached results")
+    p.add_argument("--cache-max-age", type=float, default=7.0,
+                   help="evict cache entries older than this many days (default: 7)")
+    p.add_argument("--cache-max-mb", type=float, default=50.0,
+                   help="cap the cache size in MB, oldest evicted first (default: 50)")
     p.add_argument("--report-json", type=Path,
                    help="write a JSON report with detailed results")
     p.add_argument("--report-md", type=Path,
@@ -113,6 +563,8 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     p.add_argument("--list", action="store_true",
                    help="list discovered scripts and exit")
     args = p.parse_args(list(argv) if argv is not None else None)
+    if args.merge:
+        return merge_reports(args.merge, args)
 
     inc = discover(args.include)
     # Optionally extend with bash discovery
@@ -127,6 +579,29 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     if not scripts:
         print("No scripts found for patterns:", args.include)
         return 1
+    if args.changed_since:
+        try:
+            changed = changed_files(args.changed_since)
+        except GitError as exc:
+            print(f"--changed-since {args.changed_since}: {exc}")
+            return 1
+        selected, skipped = affected(scripts, changed)
+        print_selection(selected, skipped, args.changed_since)
+        scripts = [p for p, _ in selected]
+        if not scripts:
+            print("No scripts affected; nothing to validate")
+            return 0
+    shard_items = None
+    if args.shard:
+        index, count = args.shard
+        by_key = {item_key(p): p for p in scripts}
+        shard_items = list(by_key)
+        keys, load = shard(by_key, load_timings(args.timings), index, count)
+        scripts = [by_key[k] for k in keys]
+        print(f"Shard {index}/{count}: {len(scripts)} of {len(by_key)} script(s), "
+              f"est. {load:.1f}s")
+        if not args.report_json:
+            print("Note: without --report-json this shard's durations are lost")
 
     if args.list:
         for s in scripts:
@@ -134,52 +609,37 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
             print(f"[{kind}] {s}")
         return 0
 
-    results: List[Result] = []
-    rc = 0
-    for s in scripts:
-        try:
-            if s.suffix == ".sh":
-                res = run_sh(s, args.timeout)
-            else:
-                res = run_py(s, args.timeout)
-            results.append(res)
-            if not res.ok:
-                rc = 2
-                if args.fail_fast:
-                    break
-        except sp.TimeoutExpired:
-            print(f"[{('sh' if s.suffix == '.sh' else 'py')}] {s.name} timed out ({args.timeout}s)")
-            results.append(Result(str(s), "sh" if s.suffix == ".sh" else "py", False, float(args.timeout), 124))
-            rc = 2
-            if args.fail_fast:
-                break
-
-    print_summary(results)
-
-    # Reports
-    if args.report_json:
-        payload = [
-            {
-                "path": r.path,
-                "kind": r.kind,
-                "ok": r.ok,
-                "duration": r.duration,
-                "returncode": r.returncode,
-            }
-            for r in results
-        ]
-        args.report_json.parent.mkdir(parents=True, exist_ok=True)
-        args.report_json.write_text(json.dumps(payload, indent=2))
-
-    if args.report_md:
-        lines = ["# Code Validation Report", ""]
-        for r in results:
-            status = "✅ OK" if r.ok else f"❌ FAIL ({r.returncode})"
-            lines.append(f"- {status} `{Path(r.path).name}` — {r.duration:.2f}s")
-        args.report_md.parent.mkdir(parents=True, exist_ok=True)
-        args.report_md.write_text("\n".join(lines))
-
-    return rc
+    # Benchmarks run one script at a time unless asked otherwise (less noise).
+    jobs = max(1, args.jobs or (1 if args.bench else os.cpu_count() or 1))
+    cache = None
+    # Profiling needs real runs, so it bypasses the result cache.
+    if not (args.no_cache or args.import_profile or args.bench or args.profile):
+        cache = ResultCache(max_age_days=args.cache_max_age,
+                            max_size_mb=args.cache_max_mb)
+        cache.evict()
+    if args.bench:
+        baseline = load_baseline(args.bench_baseline) if args.bench_baseline else None
+        run = partial(bench_one, timeout=args.timeout,
+                      warmup=max(0, args.warmup), repeat=max(1, args.repeat), baseline=baseline,
+                      threshold=args.bench_threshold, stat=args.bench_stat)
+    else:
+        run = partial(run_one, timeout=args.timeout, cache=cache,
+                      refresh=args.refresh, stream=args.stream,
+                      log_dir=args.log_dir,
+                      import_profile=args.import_top if args.import_profile else 0,
+                      import_budget=args.import_budget,
+                      profile_dir=args.profile_dir if args.profile else None,
+                      profile_top=args.profile_top)
+    results = run_scripts(scripts, jobs, args.fail_fast, run)
+    # shards leave the timings to --merge, so all of them partition alike
+    if not (args.profile or args.import_profile or args.shard):
+        record_timings({item_key(Path(r.path)): r.duration for r in results
+                        if r.ok and not r.cached}, args.timings)
+    if args.history:
+        record_run("validate_code", [
+            ItemRun(item_key(Path(r.path)), r.kind, r.ok, r.duration, r.cached,
+                    r.resources) for r in results], args.history)
+    return finish(results, args, shard_items)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -8,14 +8,45 @@
 Features
 - Discovers notebooks (*.ipynb) under notebooks/ (configurable via --pattern)
 - Executes each with nbclient (headless; MPLBACKEND=Agg)
-- Per-notebook timeout, fail-fast, include/exclude globs
-- Saves executed copies to tools/_executed/
+- Per-cell timeout (both engines), fail-fast, include/exclude globs
+- Runs several notebooks concurrently on a bounded pool of kernels (--jobs)
+- Saves executed copies to a content-addressed, compressed store in
+  tools/_executed/ (see tools/nb_store.py; identical outputs stored once,
+  superseded blobs removed with ``python tools/nb_store.py --prune``)
+- Incremental mode (--incremental) skips notebooks unchanged since their last
+  passing executed copy
+- Per-cell timing from nbclient's execution timestamps: slowest cells across
+  the suite, optional per-cell time budget (--cell-budget)
+- Kernel-less engine (--engine inproc) for plain-Python notebooks, falling
+  back to the kernel for magics and rich display (see tools/nb_inproc.py)
+- Kernel recycling (--reuse-kernels) keeps warm kernels alive and resets
+  their namespace between notebooks (see tools/kernel_pool.py)
+- Change-aware selection (--changed-since REF): only notebooks whose own
+  cells, local imports or referenced files changed (see tools/depgraph.py)
+- Static pre-flight: every code cell of every notebook is compiled (magics
+  and shell escapes skipped) before any kernel starts; syntax errors fail
+  fast (--no-preflight to skip)
+- Sharding across machines (--shard I/N) balanced by the durations recorded
+  in tools/_timings.json; --merge combines the per-shard JSON reports,
+  checks that every notebook ran in exactly one shard and records the
+  durations (shards themselves leave the timings file alone)
+- Run history (--history): appends per-notebook and per-cell durations, with
+  git commit and environment, to tools/_history.sqlite (see tools/history.py)
 - Prints a detailed summary; optional JSON/Markdown reports
 
 Usage
   python tools/validate_notebooks.py
   python tools/validate_notebooks.py --timeout 300 --report-json tools/nb_report.json
   python tools/validate_notebooks.py --include 'notebooks/08_*.ipynb'
+  python tools/validate_notebooks.py --jobs 4
+  python tools/validate_notebooks.py --incremental
+  python tools/validate_notebooks.py --reuse-kernels
+  python tools/validate_notebooks.py --engine inproc
+  python tools/validate_notebooks.py --changed-since origin/main
+  python tools/validate_notebooks.py --shard 1/2 --report-json nb_shard1.json
+  python tools/validate_notebooks.py --merge nb_shard*.json
+  python tools/validate_notebooks.py --slowest 5 --cell-budget 10
+  python tools/validate_notebooks.py --history
 
 Requirements
   pip install nbclient nbformat
@@ -24,16 +55,26 @@ Requirements
 from __future__ import annotations
 
 import argparse
+import ast
+import asyncio
+import hashlib
 import json
 import os
+import subprocess as sp
 import sys
+import tempfile
 import time
-from dataclasses import asdict, dataclass
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
 from uuid import uuid4
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Tuple
 import re
 
+from result_cache import environment_fingerprint
+
 
 try:
     import nbformat  # type: ignore
@@ -45,6 +86,14 @@ except Exception as exc:  # pragma: no cover
           file=sys.stderr)
     raise
 
+from depgraph import GitError, affected, changed_files, print_selection
+from history import HISTORY_DB, ItemRun, record_run
+from kernel_pool import KernelPool
+from nb_inproc import inproc_command, kernel_required
+from nb_store import NotebookStore
+from timings import (TIMINGS_FILE, check_shards, item_key, load_timings,
+                     record_timings, shard, shard_spec)
+
 
 @dataclass
 class Failure:
@@ -56,12 +105,25 @@ class Failure:
     snippet: str
 
 
+@dataclass
+class CellTiming:
+    index: int
+    duration: float  # seconds from execute_input to execute_reply
+    snippet: str  # first source line
+    over_budget: bool = False
+
+
 @dataclass
 class Result:
     notebook: str
     ok: bool
     duration: float
     failure: Optional[Failure] = None
+    cached: bool = False
+    warm_kernel: bool = False  # ran on a recycled kernel (--reuse-kernels)
+    engine: str = "kernel"  # or "inproc"
+    cells: List[CellTiming] = field(default_factory=list)
+    over_budget: bool = False  # some cell exceeded --cell-budget
 
 
 def discover(patterns: Iterable[str]) -> List[Path]:
@@ -148,60 +210,468 @@ def _load_notebook(nb_path: Path):
         raise
 
 
-def execute_notebook(nb_path: Path, timeout: int, kernel: str, exec_dir: Path,
-                     normalize_inplace: bool = True) -> Result:
-    os.environ.setdefault("MPLBACKEND", "Agg")
-    t0 = time.perf_counter()
-    nb = _load_notebook(nb_path)
-    nb = _normalize_ids(nb)
-    # Optionally write the normalized notebook back in place to silence future warnings
-    if normalize_inplace:
+def _differs_on_disk(nb, nb_path: Path) -> bool:
+    """Whether writing ``nb`` back would change what ``nb_path`` contains."""
+    try:
+        on_disk = json.loads(nb_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return True
+    return on_disk != json.loads(nbformat.writes(nb))
+
+
+def _collect_failure(nb, nb_path: Path, e: CellExecutionError) -> Failure:
+    # locate the errored cell
+    cell_idx = getattr(e, "cell_index", -1)
+    # find last error output
+    ename = getattr(e, "ename", "ExecutionError")
+    evalue = getattr(e, "evalue", str(e))
+    tb: List[str] = []
+    snippet = ""
+    try:
+        if 0 <= cell_idx < len(nb.cells):
+            cell = nb.cells[cell_idx]
+            src = cell.get("source", "")
+            snippet = "\n".join(str(src).splitlines()[:20])
+            for out in cell.get("outputs", []):
+                if out.get("output_type") == "error":
+                    ename = out.get("ename", ename)
+                    evalue = out.get("evalue", evalue)
+                    tb = out.get("traceback", [])
+    except Exception:
+        pass
+    return Failure(nb_path.name, cell_idx, ename, evalue, tb, snippet)
+
+
+def _engine_failure(nb, nb_path: Path, e: Exception) -> Failure:
+    """A :class:`Failure` for an exception that is not a cell error.
+
+    The cell is the one that started but never got a reply (a cell timeout
+    or a kernel that died under it), or -1 if none did (e.g. the kernel did
+    not start).
+    """
+    cell_idx = -1
+    for i, cell in enumerate(nb.cells):
+        meta = cell.get("metadata", {}).get("execution", {})
+        if "iopub.execute_input" in meta and "shell.execute_reply" not in meta:
+            cell_idx = i
+            break
+    snippet = ""
+    if cell_idx >= 0:
+        snippet = "\n".join(str(nb.cells[cell_idx].get("source", "")).splitlines()[:20])
+    tb = traceback.format_exception_only(type(e), e)
+    return Failure(nb_path.name, cell_idx, type(e).__name__, str(e).strip(),
+                   tb, snippet)
+
+
+def _timestamp(text: str) -> datetime:
+    # nbclient writes UTC ISO-8601 with a trailing "Z"
+    return datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+
+def cell_timings(nb) -> List[CellTiming]:
+    """Run time of every executed code cell.
+
+    nbclient (``record_timing``, on by default) stamps each cell's
+    ``metadata.execution`` with the kernel's message timestamps; cells
+    without them (not executed) are skipped.
+    """
+    timings: List[CellTiming] = []
+    for idx, cell in enumerate(nb.cells):
+        meta = cell.get("metadata", {}).get("execution", {})
+        start = meta.get("iopub.execute_input") or meta.get("iopub.status.busy")
+        end = meta.get("shell.execute_reply") or meta.get("iopub.status.idle")
+        if not (start and end):
+            continue
         try:
-            nbformat.write(nb, nb_path)
-        except Exception:
-            pass
-    client = NotebookClient(nb, timeout=timeout, kernel_name=kernel)
+            dur = (_timestamp(end) - _timestamp(start)).total_seconds()
+        except ValueError:
+            continue
+        lines = str(cell.get("source", "")).strip().splitlines()
+        timings.append(CellTiming(idx, max(dur, 0.0), lines[0][:60] if lines else ""))
+    return timings
+
+
+def apply_cell_budget(res: Result, budget: Optional[float]) -> Result:
+    """Flag cells slower than ``budget`` seconds; such a notebook fails."""
+    if budget is None:
+        return res
+    for cell in res.cells:
+        cell.over_budget = cell.duration > budget
+    if res.ok and any(c.over_budget for c in res.cells):
+        res.ok = False
+        res.over_budget = True
+    return res
+
+
+# Parse only (no code objects); cells may use top-level await like a kernel.
+_COMPILE_FLAGS = ast.PyCF_ONLY_AST | ast.PyCF_ALLOW_TOP_LEVEL_AWAIT
+
+# IPython-only lines for when IPython itself is not importable: line
+# magics and shell escapes (also as ``x = !cmd``) and ``obj?`` help, each
+# only as a whole logical line; they become ``pass`` to keep line numbers.
+_IPYTHON_LINE = re.compile(r"^\s*(?:[%!]|\w+\s*=\s*[%!])|^\s*[\w.]+\?{1,2}\s*$")
+
+
+def _neutralize_ipython(source: str) -> str:
+    """``source`` with IPython-only lines replaced by ``pass``.
+
+    Lines that continue a bracket or a triple-quoted string are left as
+    they are (a rough scan; comments and short strings are skipped).
+    """
+    lines = []
+    depth, quote = 0, None  # open brackets, open triple quote
+    for line in source.splitlines():
+        if depth == 0 and quote is None and _IPYTHON_LINE.search(line):
+            indent = line[: len(line) - len(line.lstrip())]
+            lines.append(indent + "pass")
+            continue
+        lines.append(line)
+        i = 0
+        while i < len(line):
+            if quote is not None:
+                if line.startswith(quote, i):
+                    quote, i = None, i + 3
+                    continue
+            elif line.startswith(('"""', "'''"), i):
+                quote, i = line[i:i + 3], i + 3
+                continue
+            elif line[i] in "\"'":  # one-line string: skip to its end
+                end = line.find(line[i], i + 1)
+                i = len(line) if end < 0 else end + 1
+                continue
+            elif line[i] == "#":
+                break
+            elif line[i] in "([{":
+                depth += 1
+            elif line[i] in ")]}":
+                depth = max(0, depth - 1)
+            i += 1
+    return "\n".join(lines)
+
+
+def _python_source(source: str) -> Optional[str]:
+    """Compilable form of a cell: ``source`` itself if it parses, else with
+    IPython syntax translated (``None`` for cell magics).
+
+    The translation uses IPython's own input transformer (line numbers are
+    kept); without IPython, magic, shell and help lines become ``pass``.
+    """
+    if source.lstrip().startswith("%%"):
+        return None
     try:
-        import asyncio
+        compile(source, "<cell>", "exec", dont_inherit=True, flags=_COMPILE_FLAGS)
+        return source
+    except SyntaxError:
+        pass
+    try:
+        from IPython.core.inputtransformer2 import TransformerManager  # type: ignore
+    except ImportError:
+        return _neutralize_ipython(source)
+    return TransformerManager().transform_cell(source)
+
+
+def preflight(nb_path: Path) -> Optional[Failure]:
+    """Compile every code cell of ``nb_path``; the first syntax error wins."""
+    try:
+        # plain JSON is enough here and much faster than validating nbformat
+        cells = json.loads(nb_path.read_text(encoding="utf-8"))["cells"]
+    except (OSError, ValueError, KeyError):
+        try:
+            cells = _load_notebook(nb_path).cells
+        except Exception as exc:
+            return Failure(nb_path.name, -1, type(exc).__name__, str(exc), [], "")
+    for idx, cell in enumerate(cells):
+        if cell.get("cell_type") != "code":
+            continue
+        source = cell.get("source", "")
+        source = "".join(source) if isinstance(source, list) else str(source)
+        code = _python_source(source)
+        if code is None:
+            continue
+        try:
+            compile(code, f"<cell {idx}>", "exec", dont_inherit=True,
+                    flags=_COMPILE_FLAGS)
+        except SyntaxError as exc:
+            tb = traceback.format_exception_only(type(exc), exc)
+            return Failure(nb_path.name, idx, type(exc).__name__,
+                           f"{exc.msg} (line {exc.lineno})",
+                           [line.rstrip("\n") for line in tb],
+                           "\n".join(source.splitlines()[:20]))
+    return None
+
+
+def preflight_all(nbs: List[Path], jobs: int = 4) -> List[Failure]:
+    """Pre-flight ``nbs`` on a thread pool; failures in discovery order."""
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as ex:
+        return [f for f in ex.map(preflight, nbs) if f is not None]
+
+
+# Key under which run status and input fingerprint are kept in the metadata
+# of executed copies (see tools/nb_store.py).
+META_KEY = "primer_validation"
+
+
+def input_fingerprint(nb, kernel: str, engine: str = "kernel") -> str:
+    """Hash of all cell types/sources, the kernel name and the environment.
+
+    Cell ids and outputs are ignored, so re-normalizing or executing a
+    notebook does not change its fingerprint.
+    """
+    payload = {
+        "kernel": kernel,
+        "env": environment_fingerprint(),
+        "cells": [[c.get("cell_type"), str(c.get("source", ""))]
+                  for c in nb.cells],
+    }
+    if engine != "kernel":
+        payload["engine"] = engine
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _reuse_previous(nb_path: Path, exec_dir: Path,
+                    fingerprint: str) -> Optional[Result]:
+    """Return the stored passing result if the executed copy is up to date."""
+    store = NotebookStore(exec_dir)
+    prev = store.get(nb_path.stem)
+    if prev is None:
+        return None
+    meta = prev.metadata.get(META_KEY, {})
+    if meta.get("input_hash") != fingerprint or not meta.get("ok"):
+        return None
+    duration = store.run_info(nb_path.stem).get("duration",
+                                                 meta.get("duration", 0.0))
+    return Result(nb_path.name, True, float(duration),
+                  cached=True, cells=cell_timings(prev))
+
+
+async def _execute_kernel(nb, nb_path: Path, timeout: int, kernel: str,
+                          pool: Optional[KernelPool]) -> tuple:
+    """Run ``nb`` on a Jupyter kernel; return ``(failure, warm_kernel)``."""
+    warm = None
+    if pool is not None:
         try:
-            # Prefer explicit async path to avoid event loop policy issues
-            asyncio.run(client.async_execute())
-        except RuntimeError:
-            # If an event loop is already running, fall back to sync execute
-            client.execute()
+            warm = await pool.acquire()
+        except Exception as e:  # kernel did not start
+            return _engine_failure(nb, nb_path, e), False
+        # a client given km (and kc) neither starts nor shuts down the kernel
+        client = NotebookClient(nb, timeout=timeout, kernel_name=kernel,
+                                km=warm.km)
+        client.kc = warm.kc
+    else:
+        client = NotebookClient(nb, timeout=timeout, kernel_name=kernel)
+    failure = None
+    ok = False
+    try:
+        await client.async_execute()
         ok = True
-        failure = None
     except CellExecutionError as e:  # gather details
-        ok = False
-        # locate the errored cell
-        cell_idx = getattr(e, "cell_index", -1)
-        # find last error output
-        ename = getattr(e, "ename", "ExecutionError")
-        evalue = getattr(e, "evalue", str(e))
-        tb: List[str] = []
-        snippet = ""
+        failure = _collect_failure(nb, nb_path, e)
+    except Exception as e:  # timeout, dead kernel, kernel did not start
+        failure = _engine_failure(nb, nb_path, e)
+    finally:
+        if warm is not None:
+            pool.release(warm, ok)
+    return failure, warm is not None and warm.reused
+
+
+async def _execute_inproc(nb, nb_path: Path, timeout: int) -> Optional[Failure]:
+    """Run the code cells of ``nb`` in a fresh interpreter (tools/nb_inproc.py).
+
+    Outputs and execution timestamps are written into ``nb`` like nbclient
+    does; an exception is mapped back to its cell as a :class:`Failure`.
+    As with the kernel, ``timeout`` applies to each cell (enforced by the
+    driver); the driver as a whole is only killed after ``timeout`` per
+    code cell plus a grace period, e.g. if a cell is stuck in C code.
+    """
+    code = [{"index": i, "source": str(c.get("source", ""))}
+            for i, c in enumerate(nb.cells) if c.get("cell_type") == "code"]
+    with tempfile.TemporaryDirectory() as tmp:
+        result_path = Path(tmp) / "result.json"
+        proc = await asyncio.create_subprocess_exec(
+            *inproc_command(result_path, timeout), stdin=sp.PIPE,
+            stdout=sp.DEVNULL, stderr=sp.PIPE)
+        limit = timeout * max(1, len(code)) + 30
+        try:
+            _, stderr = await asyncio.wait_for(
+                proc.communicate(json.dumps(code).encode()), limit)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return Failure(nb_path.name, -1, "TimeoutError",
+                           f"inproc driver did not finish within {limit}s", [], "")
         try:
-            if 0 <= cell_idx < len(nb.cells):
-                cell = nb.cells[cell_idx]
-                src = cell.get("source", "")
-                snippet = "\n".join(str(src).splitlines()[:20])
-                for out in cell.get("outputs", []):
-                    if out.get("output_type") == "error":
-                        ename = out.get("ename", ename)
-                        evalue = out.get("evalue", evalue)
-                        tb = out.get("traceback", [])
+            result = json.loads(result_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            text = stderr.decode(errors="replace").strip()
+            return Failure(nb_path.name, -1, "EngineError",
+                           f"inproc driver exited with {proc.returncode}",
+                           text.splitlines()[-20:], "")
+    for count, rec in enumerate(result["cells"], start=1):
+        cell = nb.cells[rec["index"]]
+        cell.outputs = [nbformat.from_dict(o) for o in rec["outputs"]]
+        cell.execution_count = count
+        cell.metadata["execution"] = {"iopub.execute_input": rec["start"],
+                                      "shell.execute_reply": rec["end"]}
+    err = result.get("error")
+    if not err:
+        return None
+    src = str(nb.cells[err["index"]].get("source", ""))
+    return Failure(nb_path.name, err["index"], err["ename"], err["evalue"],
+                   err["traceback"], "\n".join(src.splitlines()[:20]))
+
+
+async def async_execute_notebook(nb_path: Path, timeout: int, kernel: str,
+                                 exec_dir: Path,
+                                 normalize_inplace: bool = True,
+                                 incremental: bool = False,
+                                 pool: Optional[KernelPool] = None,
+                                 cell_budget: Optional[float] = None,
+                                 engine: str = "kernel") -> Result:
+    """Execute one notebook on its own kernel inside the running event loop.
+
+    With ``incremental`` the notebook is skipped (and its previous passing
+    result reused) when its executed copy was produced from identical cell
+    sources, kernel and environment. With a ``pool`` the notebook borrows a
+    warm kernel instead of starting one. Cells running longer than
+    ``cell_budget`` seconds fail the notebook. With ``engine="inproc"`` a
+    plain-Python notebook runs without a kernel (others still use one).
+    """
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    t0 = time.perf_counter()
+    nb = _load_notebook(nb_path)
+    nb = _normalize_ids(nb)
+    if engine == "inproc":
+        reason = kernel_required(nb)
+        if reason is not None:
+            print(f"[nb] {nb_path.name} needs the kernel ({reason})", flush=True)
+            engine = "kernel"
+    fingerprint = input_fingerprint(nb, kernel, engine)
+    if incremental:
+        prev = _reuse_previous(nb_path, exec_dir, fingerprint)
+        if prev is not None:
+            return apply_cell_budget(prev, cell_budget)
+    # Optionally write the normalized notebook back in place to silence
+    # future warnings (only if normalizing actually changed it)
+    if normalize_inplace and _differs_on_disk(nb, nb_path):
+        try:
+            nbformat.write(nb, nb_path)
         except Exception:
             pass
-        failure = Failure(nb_path.name, cell_idx, ename, evalue, tb, snippet)
-    # save executed notebook
-    exec_dir.mkdir(parents=True, exist_ok=True)
-    out_path = exec_dir / (nb_path.stem + ".executed.ipynb")
+    warm_kernel = False
+    if engine == "inproc":
+        failure = await _execute_inproc(nb, nb_path, timeout)
+    else:
+        failure, warm_kernel = await _execute_kernel(nb, nb_path, timeout,
+                                                     kernel, pool)
+    ok = failure is None
+    dur = time.perf_counter() - t0
+    # save executed notebook, stamped with what it was produced from
+    nb.metadata[META_KEY] = {"input_hash": fingerprint, "ok": ok}
     try:
-        nbformat.write(nb, out_path)
+        NotebookStore(exec_dir).put(nb_path.stem, nb, run={"duration": dur})
     except Exception:
         pass
-    dur = time.perf_counter() - t0
-    return Result(nb_path.name, ok, dur, failure)
+    res = Result(nb_path.name, ok, dur, failure,
+                 warm_kernel=warm_kernel, engine=engine, cells=cell_timings(nb))
+    return apply_cell_budget(res, cell_budget)
+
+
+def execute_notebook(nb_path: Path, timeout: int, kernel: str, exec_dir: Path,
+                     normalize_inplace: bool = True,
+                     incremental: bool = False,
+                     cell_budget: Optional[float] = None) -> Result:
+    """Synchronous wrapper around :func:`async_execute_notebook`."""
+    coro = async_execute_notebook(nb_path, timeout, kernel, exec_dir,
+                                  normalize_inplace, incremental,
+                                  cell_budget=cell_budget)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Prefer explicit async path to avoid event loop policy issues
+        return asyncio.run(coro)
+    # An event loop is already running (e.g. inside Jupyter): give the
+    # coroutine a private loop on a helper thread.
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        return ex.submit(asyncio.run, coro).result()
+
+
+async def run_notebooks(nbs: List[Path], timeout: int, kernel: str,
+                        exec_dir: Path, jobs: int = 1,
+                        fail_fast: bool = False,
+                        incremental: bool = False,
+                        pool: Optional[KernelPool] = None,
+                        cell_budget: Optional[float] = None,
+                        engine: str = "kernel") -> List[Result]:
+    """Execute ``nbs`` with at most ``jobs`` kernels alive at any time.
+
+    All notebooks share one event loop; a semaphore bounds the number of
+    concurrently running kernels. With ``fail_fast`` no new notebook is
+    started after the first failure. A ``pool`` supplies recycled kernels
+    and is closed at the end. Results come back in discovery order.
+    """
+    sem = asyncio.Semaphore(max(1, jobs))
+    done: dict[int, Result] = {}
+    failed = False
+
+    async def worker(idx: int, nb: Path) -> None:
+        nonlocal failed
+        async with sem:
+            if fail_fast and failed:
+                return
+            print(f"[nb] executing {nb} ...", flush=True)
+            t0 = time.perf_counter()
+            try:
+                res = await async_execute_notebook(nb, timeout, kernel, exec_dir,
+                                                   normalize_inplace=True,
+                                                   incremental=incremental,
+                                                   pool=pool,
+                                                   cell_budget=cell_budget,
+                                                   engine=engine)
+            except Exception as e:  # never cancel the other notebooks
+                res = Result(nb.name, False, time.perf_counter() - t0,
+                             Failure(nb.name, -1, type(e).__name__, str(e),
+                                     traceback.format_exception_only(type(e), e),
+                                     ""))
+            if res.cached:
+                print(f"[nb] {nb} unchanged, reused previous result", flush=True)
+            done[idx] = res
+            if not res.ok:
+                failed = True
+
+    try:
+        await asyncio.gather(*(worker(i, nb) for i, nb in enumerate(nbs)))
+    finally:
+        if pool is not None:
+            await pool.close()
+    return [done[i] for i in sorted(done)]
+
+
+def _status(r: Result) -> str:
+    if r.over_budget:
+        return "SLOW(cell)"
+    if r.cached:
+        return "OK(cached)"
+    return "OK" if r.ok else "FAIL"
+
+
+def slowest_cells(results: List[Result], n: int) -> List[tuple]:
+    """``(notebook, CellTiming)`` pairs of the ``n`` slowest cells overall."""
+    cells = [(r.notebook, c) for r in results for c in r.cells]
+    return sorted(cells, key=lambda nc: -nc[1].duration)[:n]
+
+
+def print_slowest_cells(results: List[Result], n: int,
+                        budget: Optional[float] = None) -> None:
+    top = slowest_cells(results, n)
+    if not top:
+        return
+    print(f"\nSlowest {len(top)} cells:")
+    for nb_name, c in top:
+        flag = f"  > budget {budget:.2f}s" if c.over_budget else ""
+        print(f"  {c.duration:7.2f}s  {nb_name} [cell {c.index}]  {c.snippet}{flag}")
+    over = [(r.notebook, c) for r in results for c in r.cells if c.over_budget]
+    if over and budget is not None:
+        print(f"  {len(over)} cell(s) over the {budget:.2f}s budget")
 
 
 def print_summary(results: List[Result]) -> None:
@@ -209,10 +679,12 @@ def print_summary(results: List[Result]) -> None:
     passed = sum(1 for r in results if r.ok)
     print("\nNotebook validation summary:")
     for r in results:
-        status = "OK" if r.ok else "FAIL"
-        print(f"  {r.notebook:40} {status:6} {r.duration:6.2f}s")
+        status = _status(r)
+        note = ("  (warm kernel)" if r.warm_kernel
+                else "  (inproc)" if r.engine == "inproc" else "")
+        print(f"  {r.notebook:40} {status:10} {r.duration:6.2f}s{note}")
     print(f"\nPassed {passed}/{total} notebooks")
-    fails = [r for r in results if not r.ok]
+    fails = [r for r in results if r.failure]
     if fails:
         print("\nDetailed failures:")
         for r in fails:
@@ -229,50 +701,63 @@ def print_summary(results: List[Result]) -> None:
                 print("\nCell snippet:\n" + f.snippet)
 
 
-def main(argv: Optional[Iterable[str]] = None) -> int:
-    p = argparse.ArgumentParser(description=__doc__)
-    p.add_argument("--include", action="append", default=["notebooks/*.ipynb"],
-                   help="glob(s) of notebooks to include (default: notebooks/*.ipynb)")
-    p.add_argument("--exclude", action="append", default=[],
-                   help="globs to exclude (applied after include)")
-    p.add_argument("--timeout", type=int, default=300,
-                   help="per-notebook timeout in seconds (default: 300)")
-    p.add_argument("--kernel", default="python3",
-                   help="Jupyter kernel name (default: python3)")
-    p.add_argument("--fail-fast", action="store_true",
-                   help="stop at first failure")
-    p.add_argument("--report-json", type=Path,
-                   help="write a JSON report with detailed results")
-    p.add_argument("--report-md", type=Path,
-                   help="write a Markdown summary report")
-    args = p.parse_args(list(argv) if argv is not None else None)
+def load_reports(paths: Iterable[Path]
+                 ) -> Tuple[List[Result], List[Tuple[str, List[str], List[Result]]]]:
+    """Results from JSON reports written by --report-json, plus one
+    ``(shard, items, results)`` entry per report written with --shard."""
+    names = {f.name for f in fields(Result)}
+    results = []
+    shards = []
+    for path in paths:
+        data = json.loads(path.read_text())
+        own = []
+        for d in data["results"] if isinstance(data, dict) else data:
+            d = {k: v for k, v in d.items() if k in names}
+            if d.get("failure"):
+                d["failure"] = Failure(**d["failure"])
+            d["cells"] = [CellTiming(**c) for c in d.get("cells", [])]
+            own.append(Result(**d))
+        if isinstance(data, dict):
+            shards.append((data["shard"], data["items"], own))
+        results += own
+    return sorted(results, key=lambda r: r.notebook), shards
+
+
+def merge_reports(paths: Iterable[Path], args: argparse.Namespace) -> int:
+    """--merge: one summary for several reports.
+
+    Shard reports must add up (every notebook in exactly one shard); only
+    then are their durations folded into the timings file.
+    """
+    results, shards = load_reports(paths)
+    keys = {Path(k).name: k for _, items, _ in shards for k in items}
+    problems = check_shards((label, items, [keys.get(r.notebook, r.notebook)
+                                            for r in rs])
+                            for label, items, rs in shards)
+    if shards and not problems:
+        record_timings({keys[r.notebook]: r.duration
+                        for _, _, rs in shards for r in rs
+                        if r.ok and not r.cached}, args.timings)
+    rc = finish(results, args)
+    if problems:
+        print(f"\nShard reports do not add up; {args.timings} not updated:")
+        for msg in problems:
+            print(f"  {msg}")
+        return 2
+    return rc
 
-    # Discover notebooks
-    inc = discover(args.include)
-    # Exclude patterns
-    excludes: List[Path] = []
-    for pat in args.exclude:
-        excludes.extend(Path().glob(pat))
-    excl_set = {p.resolve() for p in excludes}
-    nbs = [p for p in inc if p.resolve() not in excl_set]
-    if not nbs:
-        print("No notebooks found for patterns:", args.include)
-        return 1
 
-    results: List[Result] = []
-    exec_dir = Path("tools/_executed")
-    rc = 0
-    for nb in nbs:
-        print(f"[nb] executing {nb} ...")
-        res = execute_notebook(nb, args.timeout, args.kernel, exec_dir,
-                               normalize_inplace=True)
-        results.append(res)
-        if not res.ok:
-            rc = 2
-            if args.fail_fast:
-                break
+def finish(results: List[Result], args: argparse.Namespace,
+           shard_items: Optional[List[str]] = None) -> int:
+    """Print the summaries and write the reports; return the exit code.
+
+    With ``--shard`` the JSON report also names the shard and all items
+    the partition was computed from (``shard_items``), for --merge.
+    """
+    rc = 0 if all(r.ok for r in results) else 2
 
     print_summary(results)
+    print_slowest_cells(results, args.slowest, args.cell_budget)
 
     # JSON report
     if args.report_json:
@@ -281,10 +766,18 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
                 "notebook": r.notebook,
                 "ok": r.ok,
                 "duration": r.duration,
+                "cached": r.cached,
+                "warm_kernel": r.warm_kernel,
+                "engine": r.engine,
+                "over_budget": r.over_budget,
+                "cells": [asdict(c) for c in r.cells],
                 "failure": asdict(r.failure) if r.failure else None,
             }
             for r in results
         ]
+        if args.shard:
+            payload = {"shard": "{}/{}".format(*args.shard),
+                       "items": shard_items or [], "results": payload}
         args.report_json.parent.mkdir(parents=True, exist_ok=True)
         args.report_json.write_text(json.dumps(payload, indent=2))
 
@@ -292,9 +785,20 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     if args.report_md:
         lines = ["# Notebook Validation Report", ""]
         for r in results:
-            status = "✅ OK" if r.ok else "❌ FAIL"
+            status = ("❌ SLOW CELL" if r.over_budget
+                      else "✅ OK (cached)" if r.cached
+                      else "✅ OK" if r.ok else "❌ FAIL")
             lines.append(f"- {status} `{r.notebook}` — {r.duration:.2f}s")
-        fails = [r for r in results if not r.ok]
+        top = slowest_cells(results, args.slowest)
+        if top:
+            lines.append("\n## Slowest cells")
+            lines.append("\n| seconds | notebook | cell | source |")
+            lines.append("|---:|---|---:|---|")
+            for nb_name, c in top:
+                flag = " ⚠️" if c.over_budget else ""
+                lines.append(f"| {c.duration:.2f}{flag} | `{nb_name}` | {c.index} "
+                             f"| `{c.snippet.replace('|', '/')}` |")
+        fails = [r for r in results if r.failure]
         if fails:
             lines.append("\n## Failures")
             for r in fails:
@@ -311,5 +815,130 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     return rc
 
 
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__)
+    p.add_argument("--include", action="append", default=["notebooks/*.ipynb"],
+                   help="glob(s) of notebooks to include (default: notebooks/*.ipynb)")
+    p.add_argument("--exclude", action="append", default=[],
+                   help="globs to exclude (applied after include)")
+    p.add_argument("--timeout", type=int, default=300,
+                   help="per-cell timeout in seconds, for both engines "
+                        "(default: 300)")
+    p.add_argument("--kernel", default="python3",
+                   help="Jupyter kernel name (default: python3)")
+    p.add_argument("--fail-fast", action="store_true",
+                   help="stop at first failure")
+    p.add_argument("--changed-since", metavar="REF",
+                   help="only run notebooks affected by changes since git REF "
+                        "(own cells, local imports, referenced tracked files, "
+                        "requirements; untracked files are ignored)")
+    p.add_argument("--no-preflight", action="store_true",
+                   help="skip compiling all cells before starting any kernel")
+    p.add_argument("--shard", type=shard_spec, metavar="I/N",
+                   help="run only shard I of N, balanced by recorded durations")
+    p.add_argument("--timings", type=Path, default=TIMINGS_FILE,
+                   help="duration history used by --shard and updated after each "
+                        "unsharded run or --merge of shard reports "
+                        "(default: tools/_timings.json)")
+    p.add_argument("--history", type=Path, nargs="?", const=HISTORY_DB,
+                   metavar="DB",
+                   help="append this run to a SQLite history "
+                        "(default DB: tools/_history.sqlite)")
+    p.add_argument("--merge", type=Path, nargs="+", metavar="REPORT",
+                   help="combine --report-json files (e.g. of all shards) into "
+                        "one summary and report instead of running anything; "
+                        "fails if shards overlap or miss notebooks")
+    p.add_argument("--jobs", "-j", type=int, default=1,
+                   help="number of notebooks (kernels) to run concurrently (default: 1)")
+    p.add_argument("--incremental", action="store_true",
+                   help="skip notebooks whose cells, kernel and environment match "
+                        "their last passing executed copy in tools/_executed/")
+    p.add_argument("--reuse-kernels", action="store_true",
+                   help="keep up to --jobs kernels alive and reset them between "
+                        "notebooks instead of starting a fresh kernel each time")
+    p.add_argument("--engine", choices=("kernel", "inproc"), default="kernel",
+                   help="'inproc' runs plain-Python notebooks in a fresh "
+                        "interpreter without a Jupyter kernel; notebooks with "
+                        "magics or rich display still use the kernel "
+                        "(default: kernel)")
+    p.add_argument("--slowest", type=int, default=10,
+                   help="number of slowest cells to list across the suite "
+                        "(default: 10; 0 disables)")
+    p.add_argument("--cell-budget", type=float,
+                   help="fail notebooks with a cell running longer than this "
+                        "many seconds")
+    p.add_argument("--report-json", type=Path,
+                   help="write a JSON report with detailed results")
+    p.add_argument("--report-md", type=Path,
+                   help="write a Markdown summary report")
+    args = p.parse_args(list(argv) if argv is not None else None)
+    if args.merge:
+        return merge_reports(args.merge, args)
+
+    # Discover notebooks
+    inc = discover(args.include)
+    # Exclude patterns
+    excludes: List[Path] = []
+    for pat in args.exclude:
+        excludes.extend(Path().glob(pat))
+    excl_set = {p.resolve() for p in excludes}
+    nbs = [p for p in inc if p.resolve() not in excl_set]
+    if not nbs:
+        print("No notebooks found for patterns:", args.include)
+        return 1
+    if args.changed_since:
+        try:
+            changed = changed_files(args.changed_since)
+        except GitError as exc:
+            print(f"--changed-since {args.changed_since}: {exc}")
+            return 1
+        selected, skipped = affected(nbs, changed)
+        print_selection(selected, skipped, args.changed_since)
+        nbs = [p for p, _ in selected]
+        if not nbs:
+            print("No notebooks affected; nothing to validate")
+            return 0
+    shard_items = None
+    if args.shard:
+        index, count = args.shard
+        by_key = {item_key(p): p for p in nbs}
+        shard_items = list(by_key)
+        keys, load = shard(by_key, load_timings(args.timings), index, count)
+        nbs = [by_key[k] for k in keys]
+        print(f"Shard {index}/{count}: {len(nbs)} of {len(by_key)} notebook(s), "
+              f"est. {load:.1f}s")
+        if not args.report_json:
+            print("Note: without --report-json this shard's durations are lost")
+
+    if not args.no_preflight:
+        t0 = time.perf_counter()
+        failures = preflight_all(nbs, os.cpu_count() or 1)
+        if failures:
+            print(f"Pre-flight failed for {len(failures)} notebook(s) in "
+                  f"{(time.perf_counter() - t0) * 1e3:.0f} ms; no kernel started")
+            return finish([Result(f.notebook, False, 0.0, f) for f in failures],
+                          args, shard_items)
+
+    exec_dir = Path("tools/_executed")
+    pool = KernelPool(args.kernel) if args.reuse_kernels else None
+    results = asyncio.run(run_notebooks(nbs, args.timeout, args.kernel,
+                                        exec_dir, args.jobs, args.fail_fast,
+                                        args.incremental, pool,
+                                        args.cell_budget, args.engine))
+    paths = {nb.name: nb for nb in nbs}
+    if not args.shard:  # shards leave the timings to --merge
+        record_timings({item_key(paths[r.notebook]): r.duration for r in results
+                        if r.ok and not r.cached}, args.timings)
+    if args.history:
+        record_run("validate_notebooks", [
+            ItemRun(item_key(paths[r.notebook]), "nb", r.ok, r.duration,
+                    r.cached, cells=[(c.index, c.duration) for c in r.cells])
+            for r in results], args.history)
+    rc = finish(results, args, shard_items)
+    if pool is not None:
+        print(f"Kernel reuse: {pool.stats.describe()}")
+    return rc
+
+
 if __name__ == "__main__":  # pragma: no cover
     raise SystemExit(main())
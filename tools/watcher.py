@@ -0,0 +1,158 @@
+# Python Primer for Data Science and Deep Learning
+# (c) Dr. Yves J. Hilpisch
+# AI-Powered by GPT-5
+
+"""Wait for saved files in a few directories.
+
+On Linux the directories are watched with inotify (through ctypes, no
+third-party package); elsewhere, or if inotify is unavailable, their
+modification times are polled. Only files with one of the given suffixes
+count; hidden files, editor backups and .ipynb_checkpoints/ are ignored.
+Directories are watched non-recursively.
+
+:meth:`Watcher.wait` blocks until a file changes and then keeps collecting
+until no event has arrived for ``debounce`` seconds, so one burst of saves
+(an editor writing a backup, then the file, then renaming) yields one batch.
+
+Used by code/run_all.py --watch.
+
+Requirements
+  Standard library only.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x008  # written and closed: the save is complete
+IN_MOVED_TO = 0x080  # renamed into place (atomic saves)
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (name follows)
+POLL_INTERVAL = 0.25
+
+
+def _inotify_fd(dirs: Iterable[Path]) -> Tuple[int, Dict[int, Path]]:
+    """An inotify descriptor watching ``dirs`` and its watch-id map."""
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    wds = {}
+    for d in dirs:
+        wd = libc.inotify_add_watch(fd, os.fsencode(d), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            os.close(fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch({d}) failed")
+        wds[wd] = d
+    return fd, wds
+
+
+class Watcher:
+    def __init__(self, dirs: Iterable[Path], suffixes: Iterable[str],
+                 poll_interval: float = POLL_INTERVAL) -> None:
+        self.dirs = [Path(d).resolve() for d in dirs if Path(d).is_dir()]
+        self.suffixes = tuple(suffixes)
+        self.poll_interval = poll_interval
+        self.last_event = 0.0  # perf_counter() of the latest counted event
+        self._fd: Optional[int] = None
+        self._wds: Dict[int, Path] = {}
+        self._mtimes: Dict[Path, Tuple[int, int]] = {}
+        if sys.platform.startswith("linux"):
+            try:
+                self._fd, self._wds = _inotify_fd(self.dirs)
+            except (OSError, AttributeError, TypeError):
+                self._fd = None
+        if self._fd is None:
+            self._mtimes = self._snapshot()
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "polling"
+
+    def relevant(self, path: Path) -> bool:
+        name = path.name
+        return (name.endswith(self.suffixes) and not name.startswith((".", "~"))
+                and ".ipynb_checkpoints" not in path.parts)
+
+    def wait(self, debounce: float = 0.2) -> Set[Path]:
+        """Block until relevant files change; return them after a quiet period."""
+        changed: Set[Path] = set()
+        while not changed:
+            changed |= self._poll(None)
+        while True:
+            more = self._poll(debounce)
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _poll(self, timeout: Optional[float]) -> Set[Path]:
+        """Relevant changes within ``timeout`` seconds (``None``: until one)."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                return set()
+            if self._fd is not None:
+                found = self._read_events(remaining)
+            else:
+                time.sleep(self.poll_interval if remaining is None
+                           else min(self.poll_interval, remaining))
+                found = self._scan()
+            if found:
+                self.last_event = time.perf_counter()
+                return found
+
+    def _read_events(self, timeout: Optional[float]) -> Set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        found = set()
+        offset = 0
+        while offset + _EVENT.size <= len(buf):
+            wd, _mask, _cookie, length = _EVENT.unpack_from(buf, offset)
+            raw = buf[offset + _EVENT.size:offset + _EVENT.size + length]
+            offset += _EVENT.size + length
+            name = raw.rstrip(b"\0").decode(errors="replace")
+            if wd in self._wds and name:
+                path = self._wds[wd] / name
+                if self.relevant(path):
+                    found.add(path)
+        return found
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        snap = {}
+        for d in self.dirs:
+            for path in d.iterdir():
+                if not self.relevant(path):
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                snap[path] = (st.st_mtime_ns, st.st_size)
+        return snap
+
+    def _scan(self) -> Set[Path]:
+        snap = self._snapshot()
+        found = {p for p, sig in snap.items() if self._mtimes.get(p) != sig}
+        self._mtimes = snap
+        return found